@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+class ResultBuffer:
+    def __init__(self,
+                 nr_rows,
+                 columns,
+                 categories=None,
+                 id_columns=None) -> None:
+        
+        """A preallocated columnar buffer for simulation output, one typed NumPy array per column.
+
+        Args:
+            nr_rows (int): the number of rows the buffer can hold
+            columns (dict): column names mapped to their NumPy dtype
+            categories (dict, optional): category labels for columns stored as integer codes
+            id_columns (tuple, optional): two columns combined into a string "ID" column when converting to a DataFrame
+        """
+
+        self.nr_rows = nr_rows
+        self.columns = {name: np.empty(nr_rows, dtype=dtype) for name, dtype in columns.items()}
+        self.categories = categories if categories is not None else {}
+        self.id_columns = id_columns
+        self.size = 0
+
+    def append(self, values) -> None:
+
+        """Writes a block of rows to the buffer.
+        The arrays are broadcast against each other and written in C order, e.g., (scenarios, time_periods, skus) arrays
+        fill the rows scenario by scenario, period by period.
+
+        Args:
+            values (dict): an array (or scalar) per column of the buffer
+        """
+
+        if values.keys() != self.columns.keys():
+            raise ValueError("Expected a value for every column of the buffer")
+
+        block = np.broadcast_arrays(*values.values())
+        start, end = self.size, self.size + block[0].size
+        if end > self.nr_rows:
+            raise ValueError("The buffer is full")
+
+        for name, value in zip(values.keys(), block):
+            np.copyto(self.columns[name][start:end].reshape(value.shape), value, casting="unsafe")
+
+        self.size = end
+
+    def to_frame(self) -> pd.DataFrame:
+
+        """Converts the filled part of the buffer into a DataFrame without copying the numeric columns.
+
+        Returns:
+            pd.DataFrame: a row per record and a column per field
+        """
+
+        data = {}
+        if self.id_columns is not None:
+            first, second = (self.columns[c][:self.size] for c in self.id_columns)
+            data["ID"] = pd.Series(first).astype(str) + "_" + pd.Series(second).astype(str)
+
+        for name, column in self.columns.items():
+            column = column[:self.size]
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(column, categories=self.categories[name])
+            else:
+                data[name] = column
+
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,98 @@
+import os
+import numpy as np
+import ResultBuffer
+import SimulationSummary
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # Parquet output is optional
+    pa = pq = None
+
+class ResultWriter:
+    def __init__(self,
+                 path,
+                 columns,
+                 categories=None,
+                 id_columns=None) -> None:
+
+        """A streaming writer for simulation output. Each block of rows appended is written to disk straight away,
+        as CSV or, if pyarrow is installed, Parquet (chosen by the file extension). Per-simulation aggregates are
+        accumulated along the way (see SimulationSummary), so only one block is ever held in memory.
+
+        Args:
+            path (str): the output file, ending in .csv or .parquet
+            columns (dict): column names mapped to their NumPy dtype, must include "Simulation", "Total Costs",
+                            "Stockout Costs" and "Lead Time"
+            categories (dict, optional): category labels for columns stored as integer codes
+            id_columns (tuple, optional): two columns combined into a string "ID" column
+        """
+
+        self.path = path
+        self.parquet = os.path.splitext(path)[1] == ".parquet"
+        if self.parquet and pq is None:
+            raise ImportError("Writing Parquet files requires pyarrow")
+
+        self.columns = columns
+        self.categories = categories
+        self.id_columns = id_columns
+        self.buffer = None
+        self.summary = SimulationSummary.SimulationSummary()
+        self.rows_written = 0
+        self._parquet_writer = None
+
+        # start from an empty file
+        if os.path.exists(path):
+            os.remove(path)
+
+    def append(self, values) -> None:
+
+        """Writes a block of rows, e.g., the results of a batch of simulations. The arrays are broadcast against
+        each other and written in C order, as in ResultBuffer.append.
+
+        Args:
+            values (dict): an array (or scalar) per column
+        """
+
+        nr_rows = int(np.prod(np.broadcast_shapes(*(np.shape(value) for value in values.values()))))
+        # the block is formatted in a reusable buffer, reallocated only for a larger block
+        if self.buffer is None or self.buffer.nr_rows < nr_rows:
+            self.buffer = ResultBuffer.ResultBuffer(nr_rows, self.columns, self.categories, self.id_columns)
+        self.buffer.size = 0
+        self.buffer.append(values)
+
+        columns = self.buffer.columns
+        size = self.buffer.size
+        self.summary.update(columns["Simulation"][:size], columns["Total Costs"][:size],
+                            columns["Stockout Costs"][:size], columns["Lead Time"][:size])
+
+        frame = self.buffer.to_frame()
+        if self.parquet:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a", header=self.rows_written == 0, index=False)
+
+        self.rows_written += size
+
+    def close(self):
+
+        """Finishes the file.
+
+        Returns:
+            pd.DataFrame: the per-simulation summary, see SimulationSummary.to_frame
+        """
+
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+        return self.summary.to_frame()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
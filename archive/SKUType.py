@@ -2,7 +2,6 @@ import math
 import random
 import numpy as np
 import Utility as u
-import scipy.stats as stats
 
 class SKUType:
 
@@ -26,6 +25,7 @@ class SKUType:
         self.actual_inventory = actual_inventory
         self.estimated_inventory = estimated_inventory
         self.demand = demand
+        self.demand_index = None if demand is None else u.cumulative_demand(demand)
         self.policy_type = policy_type
         self.review_period = review_period
         self.max_quantity = max_quantity
@@ -67,6 +67,8 @@ class SKUType:
 
     def set_demand(self, value) -> None:
         self.demand = value
+        # cumulative demand, so that the demand over any window is a single lookup
+        self.demand_index = u.cumulative_demand(value)
 
     @u.check_integer_input
     def set_rop(self, value) -> None:
@@ -89,7 +91,7 @@ class SKUType:
             """
 
             # find k given a CSL target
-            k = round(stats.norm(0, 1).ppf(CSL),2)
+            k = u.service_factor(CSL)
 
             # find the safety stock
             safety_stock = int(k * math.sqrt(self.lead_time_mean*(self.demand_sd**2) + self.demand_mean * (self.lead_time_sd**2)))
@@ -110,16 +112,26 @@ class SKUType:
             quantity_to_order (int)
         """
         
-        upcoming_demand = 0
-        for i in range(self.lead_time_mean):
-            upcoming_demand += self.demand[current_day]
-            current_day += 1
+        upcoming_demand = self.upcoming_demand(current_day, self.lead_time_mean)
 
-        quantity_to_order = self.max_quantity - self.actual_invenotry - upcoming_demand
+        quantity_to_order = self.max_quantity - self.actual_inventory - upcoming_demand
 
         return quantity_to_order
 
 
+    def upcoming_demand(self, current_day, time_periods) -> int:
+
+        """
+        The function finds the demand over the given number of time periods starting on the current day,
+        looked up in the cumulative demand built by set_demand.
+
+        Returns:
+            upcoming_demand (int)
+        """
+
+        return u.window_demand(self.demand_index, current_day, time_periods)
+
+
     def generate_demand(self,
                         time_periods: int=90,
                         frequency: int=1,
@@ -0,0 +1,187 @@
+import heapq
+from bisect import bisect_right
+import numpy as np
+import Utility as u
+
+
+class Simulation:
+
+    """
+    A next-event simulation of the inventory of the SKUs delivered by one supplier, with the same rules and costs as
+    funcs.simulate_inventory but returning totals per scenario and SKU instead of a row per time period.
+
+    Only deliveries and order placements are processed. Between two events inventory only drops by the demand,
+    so the day of the next order (the first review day with inventory below the ROP) and the holding and stock out
+    costs up to it are found from cumulative demand sums. The work done per SKU grows with the number of orders
+    rather than the number of time periods, which pays off with long review periods and long horizons.
+    Demand must be non-negative.
+    """
+
+    def __init__(self,
+                 demand: np.array,
+                 per_item_cost: list,
+                 delivery_cost: int,
+                 holding_costs: float,
+                 stock_out_cost: int) -> None:
+
+        """
+        Inputs:
+            demand (np.array) - demand per SKU and time period, dimensions (skus, time_periods)
+            per_item_cost (list) - price tiers [min_order, max_order, price] per SKU
+            delivery_cost (int) - constant cost per delivery
+            holding_costs (float) - holding cost per item per time period
+            stock_out_cost (int) - cost per SKU and time period with a stock out
+        """
+
+        demand = np.asarray(demand, dtype=np.int64)
+        self.nr_skus, self.time_periods = demand.shape
+        self.price_tiers = u.compile_price_tiers(per_item_cost)
+        self.delivery_cost = delivery_cost
+        self.holding_costs = holding_costs
+        self.stock_out_cost = stock_out_cost
+
+        # demand before each time period and the sum of those, shared by all scenarios
+        cumulative = np.zeros((self.nr_skus, self.time_periods + 1), dtype=np.int64)
+        np.cumsum(demand, axis=1, out=cumulative[:, 1:])
+        double_cumulative = np.zeros_like(cumulative)
+        np.cumsum(cumulative[:, :-1], axis=1, out=double_cumulative[:, 1:])
+
+        self.cumulative_demand = cumulative.tolist()
+        self.double_cumulative_demand = double_cumulative.tolist()
+
+    def _simulate_sku(self,
+                      sku: int,
+                      starting_inventory: int,
+                      rop: int,
+                      review_period: int,
+                      max_quantity: int,
+                      lead_times: list) -> tuple:
+
+        """
+        Runs the events of one SKU in one scenario. Inventory on day t is level - cumulative[t], where the level only
+        changes when a delivery arrives.
+
+        Returns:
+            costs (tuple) - carryover and stock out costs
+            order_days (list) - the time periods with an order
+            orders (list) - the quantity ordered on each of those time periods
+        """
+
+        cumulative = self.cumulative_demand[sku]
+        double_cumulative = self.double_cumulative_demand[sku]
+        time_periods = self.time_periods
+
+        level = starting_inventory
+        deliveries = [] # (first time period with the delivery in stock, quantity)
+        order_days = []
+        orders = []
+        carry_over_costs = 0.0
+        stock_outs = 0
+        t = 0
+        earliest_review = 0
+
+        while t < time_periods:
+
+            next_delivery = deliveries[0][0] if deliveries else time_periods
+
+            # first review day with inventory below the ROP, assuming no deliveries
+            below_rop = max(t, earliest_review, bisect_right(cumulative, level - rop))
+            next_order = -(-below_rop // review_period) * review_period
+
+            # no events until the end of the span: inventory is positive until the first stock out
+            end = min(next_delivery, next_order, time_periods)
+            first_stock_out = min(max(t, bisect_right(cumulative, level)), end)
+            carry_over_costs += (first_stock_out - t) * level - (double_cumulative[first_stock_out] - double_cumulative[t])
+            stock_outs += end - first_stock_out
+            t = end
+
+            if t == time_periods:
+                break
+
+            if t == next_delivery:
+                while deliveries and deliveries[0][0] == t:
+                    level += heapq.heappop(deliveries)[1]
+                continue
+
+            # order up to the max quantity, delivered after the lead time of the day
+            order = max_quantity - (level - cumulative[t])
+            orders.append(order)
+            heapq.heappush(deliveries, (t + lead_times[t] + 1, order))
+            order_days.append(t)
+            earliest_review = t + 1
+
+        costs = (carry_over_costs * self.holding_costs, stock_outs * self.stock_out_cost)
+
+        return costs, order_days, orders
+
+    def run(self,
+            starting_inventory: np.array,
+            rop: np.array,
+            review_period: np.array,
+            max_quantity: np.array,
+            lead_times: np.array) -> dict:
+
+        """
+        Simulates a batch of scenarios.
+
+        Inputs:
+            starting_inventory (np.array) - starting inventory per SKU, dimensions (skus,)
+            rop (np.array) - reorder point per SKU, dimensions (skus,)
+            review_period (np.array) - review period per scenario and SKU, dimensions (scenarios, skus)
+            max_quantity (np.array) - order-up-to quantity per scenario and SKU, dimensions (scenarios, skus)
+            lead_times (np.array) - lead time of an order placed with the supplier per scenario and time period, dimensions (scenarios, time_periods)
+
+        Returns:
+            results (dict) - arrays with dimensions (scenarios, skus) for the keys "Orders", "Carryover Cost",
+                             "Delivery Cost", "Stockout Costs" and "Total Costs", totals over the time periods
+        """
+
+        starting_inventory = np.asarray(starting_inventory, dtype=np.int64).tolist()
+        rop = np.asarray(rop, dtype=np.int64).tolist()
+        review_period = np.asarray(review_period, dtype=np.int64).tolist()
+        max_quantity = np.asarray(max_quantity, dtype=np.int64).tolist()
+        lead_times = np.asarray(lead_times, dtype=np.int64).tolist()
+
+        shape = (len(review_period), self.nr_skus)
+        results = {
+            "Orders": np.zeros(shape, dtype=np.int64),
+            "Carryover Cost": np.zeros(shape),
+            "Delivery Cost": np.zeros(shape),
+            "Stockout Costs": np.zeros(shape),
+        }
+
+        # every order placed, priced in one lookup at the end
+        order_rows = []
+        order_skus = []
+        order_quantities = []
+
+        for scenario in range(shape[0]):
+            # the first SKU ordered from the supplier on a given day pays for the delivery
+            first_sku = {}
+
+            for sku in range(self.nr_skus):
+                costs, order_days, orders = self._simulate_sku(sku,
+                                                       starting_inventory[sku],
+                                                       rop[sku],
+                                                       review_period[scenario][sku],
+                                                       max_quantity[scenario][sku],
+                                                       lead_times[scenario])
+
+                results["Orders"][scenario, sku] = len(order_days)
+                results["Carryover Cost"][scenario, sku] = costs[0]
+                results["Stockout Costs"][scenario, sku] = costs[1]
+                order_rows.extend([scenario] * len(orders))
+                order_skus.extend([sku] * len(orders))
+                order_quantities.extend(orders)
+                for day in order_days:
+                    first_sku.setdefault(day, sku)
+
+            results["Delivery Cost"][scenario] += self.delivery_cost * np.bincount(list(first_sku.values()), minlength=self.nr_skus)
+
+        order_quantities = np.asarray(order_quantities, dtype=np.int64)
+        item_costs = u.lookup_breakpoints(self.price_tiers, order_skus, order_quantities) * order_quantities
+        np.add.at(results["Delivery Cost"], (np.asarray(order_rows, dtype=np.int64), np.asarray(order_skus, dtype=np.int64)), item_costs)
+
+        results["Total Costs"] = results["Carryover Cost"] + results["Delivery Cost"] + results["Stockout Costs"]
+
+        return results
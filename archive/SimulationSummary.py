@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+class SimulationSummary:
+    def __init__(self) -> None:
+
+        """Per-simulation aggregates of simulation results, accumulated block by block with np.bincount so the
+        row-level results never need to be held in memory at once.
+        """
+
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.total_costs = np.zeros(0)
+        self.stockout_costs = np.zeros(0)
+        self.lead_time_sum = np.zeros(0)
+        self.lead_time_count = np.zeros(0)
+
+    def update(self,
+               simulation,
+               total_costs,
+               stockout_costs,
+               lead_time) -> None:
+
+        """Adds a block of result rows to the aggregates. The arrays are broadcast against each other.
+
+        Args:
+            simulation (np.array): the simulation of each row
+            total_costs (np.array): the total costs of each row
+            stockout_costs (np.array): the stock out costs of each row
+            lead_time (np.array): the lead time of each row, 0 if nothing was ordered
+        """
+
+        simulation, total_costs, stockout_costs, lead_time = (np.ravel(a) for a in np.broadcast_arrays(
+            simulation, total_costs, stockout_costs, lead_time))
+        if not simulation.size:
+            return
+
+        size = max(len(self.rows), int(simulation.max()) + 1)
+        for name in ("rows", "total_costs", "stockout_costs", "lead_time_sum", "lead_time_count"):
+            aggregate = getattr(self, name)
+            setattr(self, name, np.pad(aggregate, (0, size - len(aggregate))))
+
+        self.rows += np.bincount(simulation, minlength=size)
+        self.total_costs += np.bincount(simulation, weights=total_costs, minlength=size)
+        self.stockout_costs += np.bincount(simulation, weights=stockout_costs, minlength=size)
+        # the average lead time only counts the rows with an order
+        self.lead_time_sum += np.bincount(simulation, weights=lead_time, minlength=size)
+        self.lead_time_count += np.bincount(simulation, weights=lead_time != 0, minlength=size)
+
+    def to_frame(self) -> pd.DataFrame:
+
+        """Converts the aggregates into a table with a row per simulation. The rank is based on the totals so far.
+
+        Returns:
+            pd.DataFrame: "Simulation", "Total Costs By Sim", "Rank Based on Cost", "Did Stock Out" and "Average Lead Time Sim"
+        """
+
+        simulations = np.flatnonzero(self.rows)
+        total_costs = pd.Series(self.total_costs[simulations])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            lead_time = self.lead_time_sum[simulations] / self.lead_time_count[simulations]
+
+        return pd.DataFrame({
+            "Simulation": simulations,
+            "Total Costs By Sim": total_costs,
+            "Rank Based on Cost": total_costs.rank(ascending=True),
+            "Did Stock Out": self.stockout_costs[simulations] > 0,
+            "Average Lead Time Sim": lead_time,
+        })
@@ -78,7 +78,7 @@ class SolutionGenerator:
                     if s.rop > s.estimated_inventory:
                         
                         # how much stock will be required to fullfill demnad before the order arrives?
-                        upcoming_demand = sum(s.demand[p:(p + s.lead_time_mean + 1)])
+                        upcoming_demand = s.upcoming_demand(p, s.lead_time_mean + 1)
 
                         qantity_to_order = s.max_quantity - s.estimated_inventory + upcoming_demand 
                         # ensure the quantity ordered doesn't exceed max quantity 
@@ -108,8 +108,10 @@ class SolutionGenerator:
                 items = [] # items to be ordered from the suppliers go here
                 quantities = [] # quanities to be ordered go here
                 prices = [] # price per item go here
+                # price every order with the supplier in one lookup
+                supplier_prices = supplier.find_sku_prices([o[1].name for o in to_be_ordered], [o[2] for o in to_be_ordered])
        
-                for o in to_be_ordered:
+                for o_i, o in enumerate(to_be_ordered):
 
                     item = o[1]
                     quantity = o[2]
@@ -118,7 +120,7 @@ class SolutionGenerator:
 
                     if item not in already_ordered: 
                         if quantity != 0:       
-                            item_price  = supplier.find_sku_price(item.name, quantity)
+                            item_price  = float(supplier_prices[o_i])
 
                             # assign item if it's delivered by the supplier
                             if item_price != 0:
@@ -1,4 +1,6 @@
+import numpy as np
 from scipy.stats import halfnorm
+import Utility as u
 
 class Supplier:
     def __init__(self,
@@ -13,6 +15,25 @@ class Supplier:
         self.delivery_cost = delivery_cost
         self.lead_time = lead_time
         self.risk = risk # standrd deviation of the supplier's lead times
+        self.compile_prices()
+
+    def compile_prices(self) -> None:
+        """Compiles the price schedules of the items delivered into a lookup table of the discount by item and 
+        quantity. Must be called again if items_delivered changes.
+        """
+        self.item_index = {item: i for i, item in enumerate(self.items_delivered)}
+        self.price_per_item = np.array([self.items_delivered[item]["price_per_item"] for item in self.item_index], dtype=float)
+
+        breakpoints = []
+        discounts = []
+        for item in self.item_index:
+            # the discounts are checked in order until a threshold is above the quantity, 
+            # so a threshold is only reached once all the previous ones are
+            schedule = self.items_delivered[item]["discount"]
+            breakpoints.append(np.maximum.accumulate(list(schedule.values())) if schedule else [])
+            discounts.append(list(schedule))
+
+        self.discount_table = u.compile_breakpoints(breakpoints, discounts)
 
     def find_lead_time(self) -> int:
         lead_time = halfnorm.rvs(loc = self.lead_time, scale = self.risk, size=1)
@@ -22,21 +43,27 @@ class Supplier:
                     item, 
                     quantity) -> float:
         
-        # item is not delivered by the supplier
-        if item not in self.items_delivered.keys():
-            return 0 
-        # find the item's base price
-        base_price = quantity * self.items_delivered[item]["price_per_item"]
-        discount = 0
-        
-        # check if the order qualifies for a discount
-        for d in self.items_delivered[item]["discount"]:
-            if quantity < self.items_delivered[item]["discount"][d]:
-                break
-                
-            discount = d
-
-        # find the SKUs price accounting for the discount (expressed as a percentage)
+        return float(self.find_sku_prices([item], [quantity])[0])
+
+    def find_sku_prices(self,
+                        items: list,
+                        quantities: list) -> np.array:
+        """Finds the price of a batch of orders with a single lookup in the compiled price schedules.
+        Items not delivered by the supplier cost 0.
+
+        Returns:
+            sku_prices (np.array) - the price of each order
+        """
+        if not self.item_index:
+            return np.zeros(len(items))
+
+        index = np.array([self.item_index.get(item, -1) for item in items], dtype=np.int64)
+        quantities = np.asarray(quantities)
+        delivered = index >= 0
+
+        # find the items' base price and discount (expressed as a percentage)
+        base_price = quantities * self.price_per_item[index]
+        discount = u.lookup_breakpoints(self.discount_table, np.maximum(index, 0), quantities)
         sku_price = base_price * (100 - discount) / 100
 
-        return sku_price    
+        return np.where(delivered, sku_price, 0)    
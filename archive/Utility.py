@@ -1,4 +1,6 @@
+import functools
 import numpy as np
+import scipy.stats as stats
 
 def check_integer_input(func):
         def wrapper(self, input):
@@ -7,3 +9,95 @@ def check_integer_input(func):
 
             func(self, input)
         return wrapper
+
+
+@functools.lru_cache(maxsize=None)
+def service_factor(CSL: float) -> float:
+    """Finds the safety factor k of a cycle service level (CSL) target, rounded to 2 decimals. 
+    The value is cached per CSL.
+
+    Returns:
+        k (float)
+    """
+    return round(float(stats.norm.ppf(CSL)), 2)
+
+
+def cumulative_demand(demand) -> np.array:
+    """Builds a prefix-sum index of demand: index[t] is the demand before time period t.
+
+    Returns:
+        index (np.array) - cumulative demand with one more element than demand
+    """
+    index = np.zeros(len(demand) + 1, dtype=np.int64)
+    np.cumsum(demand, out=index[1:])
+
+    return index
+
+
+def window_demand(index, start, length) -> int:
+    """Finds the demand over length time periods from start in O(1), i.e., sum(demand[start:start + length]).
+    Windows running past the last time period are cut short.
+
+    Returns:
+        demand (int)
+    """
+    end = len(index) - 1
+
+    return int(index[min(start + length, end)] - index[min(start, end)])
+
+
+# offset separating the breakpoints of consecutive rows in a compiled lookup table
+BREAKPOINT_SPAN = 2**40
+
+
+def compile_breakpoints(breakpoints, values, default=0) -> tuple:
+    """Compiles step functions, one per row, into a single sorted lookup table. The value of row r at x is
+    values[r][j] for the last breakpoint breakpoints[r][j] <= x, or the default below the first breakpoint.
+    The breakpoints of each row must be sorted and lie within +/- BREAKPOINT_SPAN / 2.
+
+    Returns:
+        table (tuple) - sorted keys and the value of each key
+    """
+    keys = []
+    table_values = []
+    for row, (row_breakpoints, row_values) in enumerate(zip(breakpoints, values)):
+        # each row starts with a key for the default value, below any breakpoint
+        keys.append(row * BREAKPOINT_SPAN)
+        keys.extend(row * BREAKPOINT_SPAN + BREAKPOINT_SPAN // 2 + np.asarray(row_breakpoints, dtype=np.int64))
+        table_values.append(default)
+        table_values.extend(row_values)
+
+    return np.asarray(keys, dtype=np.int64), np.asarray(table_values, dtype=float)
+
+
+def lookup_breakpoints(table, rows, x) -> np.array:
+    """Looks up the values of a table compiled by compile_breakpoints for arrays of rows and x with a single
+    np.searchsorted. rows and x broadcast together.
+
+    Returns:
+        values (np.array)
+    """
+    keys, values = table
+    x = np.clip(x, -(BREAKPOINT_SPAN // 2) + 1, BREAKPOINT_SPAN // 2 - 1)
+    position = np.searchsorted(keys, np.asarray(rows, dtype=np.int64) * BREAKPOINT_SPAN + BREAKPOINT_SPAN // 2 + x, side='right') - 1
+
+    return values[position]
+
+
+def compile_price_tiers(per_item_cost) -> tuple:
+    """Compiles price tiers [min_order, max_order, price] per SKU into a lookup table of the price per item
+    by SKU and order size. The first tier with min_order <= order < max_order applies, orders outside every tier are free.
+
+    Returns:
+        table (tuple) - see compile_breakpoints
+    """
+    breakpoints = []
+    values = []
+    for tiers in per_item_cost:
+        # the price is constant between consecutive tier boundaries
+        bounds = sorted({c[0] for c in tiers} | {c[1] for c in tiers})
+        prices = [next((c[2] for c in tiers if c[0] <= bound < c[1]), 0) for bound in bounds]
+        breakpoints.append(bounds)
+        values.append(prices)
+
+    return compile_breakpoints(breakpoints, values)
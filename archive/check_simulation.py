@@ -0,0 +1,229 @@
+import random
+import numpy as np
+import funcs
+import Simulation
+import Supplier
+
+# totals compared between the reference loop and the simulation engines
+cost_columns = ["Carryover Cost", "Delivery Cost", "Stockout Costs", "Total Costs"]
+
+
+def reference_inventory(
+        demand: np.array,
+        starting_inventory: np.array,
+        rop: np.array,
+        review_period: np.array,
+        max_quantity: np.array,
+        lead_times: np.array,
+        per_item_cost: list,
+        delivery_cost: int,
+        holding_costs: float,
+        stock_out_cost: int
+) -> dict:
+
+    """
+    The function runs the original per-scenario, per-day, per-SKU loop of inventory_sim on a given configuration,
+    with two of its bugs fixed: each scenario starts with an empty delivery pipeline and demand is subtracted once
+    on days with several deliveries arriving. It is slow and only meant as a reference for simulate_inventory
+    and Simulation.
+
+    Inputs:
+        the same as simulate_inventory
+
+    Returns:
+        totals (dict) - arrays with dimensions (scenarios, skus) for the keys in cost_columns, totals over the time periods
+    """
+
+    nr_skus, time_periods = np.shape(demand)
+    nr_scenarios = len(review_period)
+    totals = {column: np.zeros((nr_scenarios, nr_skus)) for column in cost_columns}
+
+    for scenario in range(nr_scenarios):
+        inventory = list(starting_inventory)
+        # delivery arrival time period and size per SKU
+        t_arrival = [[] for sku in range(nr_skus)]
+        delivery_size = [[] for sku in range(nr_skus)]
+
+        for t in range(time_periods):
+            already_ordered = False
+
+            for sku in range(nr_skus):
+                d1 = 0
+                d2 = 0
+                s = 0
+                i = 1
+                sku_cost = 0
+                order = 0
+
+                # is it review day? reorder if inventory below ROP
+                if t % review_period[scenario][sku] == 0 and inventory[sku] < rop[sku]:
+                    d1 = 0 if already_ordered else 1
+                    d2 = 1
+                    order = int(max_quantity[scenario][sku] - inventory[sku])
+                    already_ordered = True
+
+                    t_arrival[sku].append(t + lead_times[scenario][t])
+                    delivery_size[sku].append(order)
+
+                    for c in per_item_cost[sku]:
+                        if order in range(c[0], c[1]):
+                            sku_cost = c[2]
+                            break
+
+                # has there been a stock out?
+                if inventory[sku] < 0:
+                    s = 1
+                    i = 0
+
+                cost = funcs.cost_function(i=i, inventory=inventory[sku], per_item_cost=sku_cost, holding_costs=holding_costs,
+                                           d1=d1, d2=d2, order_size=order, delivery_cost=delivery_cost, s=s,
+                                           stock_out_cost=stock_out_cost)
+                for column in cost_columns:
+                    totals[column][scenario, sku] += cost[column]
+
+                # find next day's inventory
+                inventory[sku] -= demand[sku][t]
+                while t in t_arrival[sku]:
+                    index = t_arrival[sku].index(t)
+                    inventory[sku] += delivery_size[sku].pop(index)
+                    t_arrival[sku].pop(index)
+
+    return totals
+
+
+def sample_configuration(
+        seed: int = 0,
+        nr_scenarios: int = 40,
+        nr_skus: int = 4,
+        time_periods: int = 60
+) -> dict:
+
+    """
+    The function samples a fixed configuration the way inventory_sim does: demand, ROPs, policies, max quantities,
+    review periods and the lead time of an order placed on every day.
+
+    Returns:
+        configuration (dict) - keyword arguments of simulate_inventory
+    """
+
+    random.seed(seed)
+    np.random.seed(seed)
+
+    demand_mean = [random.randint(300, 600) for i in range(nr_skus)]
+    demand_sd = [random.randint(50, 100) for i in range(nr_skus)]
+    demand = np.maximum(np.random.normal(demand_mean, demand_sd, (time_periods, nr_skus)).T, 0).astype(int)
+    safety_stocks = funcs.find_safety_stocks(demand_mean, demand_sd, 3, 2)
+    rop = funcs.find_reorder_points(demand_mean, safety_stocks, 3).astype(int)
+
+    periodic = np.random.randint(0, 2, size=(nr_scenarios, nr_skus)) == 0
+
+    return {"demand": demand,
+            "starting_inventory": rop * 2,
+            "rop": rop,
+            "review_period": np.where(periodic, np.random.choice(np.arange(2, 30), size=(nr_scenarios, nr_skus)), 1),
+            # max quantities close to the ROP give small orders, priced in the lower tiers
+            "max_quantity": np.random.choice(np.concatenate([rop.min() + np.arange(0, 400, 5), np.arange(4000, 20000, 500)]), 
+                                             size=(nr_scenarios, nr_skus)),
+            "lead_times": np.random.choice(np.arange(0, 14), size=(nr_scenarios, time_periods)),
+            "per_item_cost": ([[[0, 50, 0.9], [51, 120, 0.7], [121, 1000000, 0.6]],
+                               [[0, 100, 0.9], [101, 300, 0.7], [301, 100000, 0.6]]] * nr_skus)[:nr_skus],
+            "delivery_cost": 100,
+            "holding_costs": 0.9,
+            "stock_out_cost": 100000}
+
+
+def check_simulate_inventory(configuration: dict) -> None:
+
+    """
+    The function checks that simulate_inventory gives the cost totals of the reference loop.
+    """
+
+    expected = reference_inventory(**configuration)
+    results = funcs.simulate_inventory(**configuration)
+
+    for column in cost_columns:
+        assert np.allclose(results[column].sum(axis=1), expected[column]), column + " differs from the reference loop"
+
+
+def check_event_simulation(configuration: dict) -> None:
+
+    """
+    The function checks that the next-event Simulation gives the cost totals of the reference loop.
+    """
+
+    expected = reference_inventory(**configuration)
+    simulation = Simulation.Simulation(demand=configuration["demand"],
+                                       per_item_cost=configuration["per_item_cost"],
+                                       delivery_cost=configuration["delivery_cost"],
+                                       holding_costs=configuration["holding_costs"],
+                                       stock_out_cost=configuration["stock_out_cost"])
+    results = simulation.run(starting_inventory=configuration["starting_inventory"],
+                             rop=configuration["rop"],
+                             review_period=configuration["review_period"],
+                             max_quantity=configuration["max_quantity"],
+                             lead_times=configuration["lead_times"])
+
+    for column in cost_columns:
+        assert np.allclose(results[column], expected[column]), column + " differs from the reference loop"
+
+
+def reference_sku_price(
+        items_delivered: dict,
+        item,
+        quantity: int
+) -> float:
+
+    """
+    The function prices an order with the original loop of Supplier.find_sku_price: the discount of the last 
+    threshold reached before the first one the quantity is below.
+
+    Returns:
+        sku_price (float)
+    """
+
+    # item is not delivered by the supplier
+    if item not in items_delivered:
+        return 0
+
+    discount = 0
+    for d in items_delivered[item]["discount"]:
+        if quantity < items_delivered[item]["discount"][d]:
+            break
+        discount = d
+
+    return quantity * items_delivered[item]["price_per_item"] * (100 - discount) / 100
+
+
+def check_supplier_prices(seed: int = 0) -> None:
+
+    """
+    The function checks that Supplier.find_sku_prices gives the prices of the original loop, with discount schedules
+    whose thresholds are not always increasing, items without discounts and items the supplier does not deliver.
+    """
+
+    rng = np.random.default_rng(seed)
+    items_delivered = {}
+    for item in range(6):
+        discounts = rng.choice(np.arange(1, 30), size=item % 4, replace=False)
+        thresholds = rng.integers(0, 500, size=len(discounts))
+        items_delivered["item_" + str(item)] = {"price_per_item": float(rng.integers(1, 100)),
+                                                "discount": dict(zip(discounts.tolist(), thresholds.tolist()))}
+
+    supplier = Supplier.Supplier("supplier", items_delivered, delivery_cost=100, lead_time=3, risk=1)
+    items = ["item_" + str(item) for item in rng.integers(0, 8, size=1000)]
+    quantities = rng.integers(0, 600, size=1000)
+
+    expected = [reference_sku_price(items_delivered, item, quantity) for item, quantity in zip(items, quantities)]
+    assert np.allclose(supplier.find_sku_prices(items, quantities), expected), "prices differ from the reference loop"
+
+
+if __name__ == "__main__":
+    # short horizons and a long one, where periodic reviews leave long spans without events
+    for configuration in [sample_configuration(seed) for seed in range(3)] + [sample_configuration(3, time_periods=360)]:
+        check_simulate_inventory(configuration)
+        check_event_simulation(configuration)
+
+    for seed in range(3):
+        check_supplier_prices(seed)
+
+    print("simulate_inventory, Simulation and Supplier prices match the reference loops.")
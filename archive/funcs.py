@@ -1,9 +1,11 @@
-import math
 import random
 import pandas as pd
 import numpy as np
-import scipy.stats as stats
-from scipy.stats import halfnorm
+from scipy.stats import halfnorm, norm
+import ResultBuffer
+import SimulationSummary
+import Utility as u
+import os
 
 def generate_demand(
         nr_SKUs: int = 1,
@@ -91,14 +93,40 @@ def find_safety_stock(
         Safety stock (integer)
     """
 
+    return int(find_safety_stocks(demand_mean, demand_sd, lead_time_mean, lead_time_sd, CSL))
+
+
+def find_safety_stocks(
+        demand_mean: np.array,
+        demand_sd: np.array,
+        lead_time_mean: np.array,
+        lead_time_sd: np.array,
+        CSL: np.array = 0.999
+) -> np.array:
+    
+    """
+    The function finds the safety stock (SS) of a whole catalogue of items in one pass, following the formula:
+    SS = k * (Lead Time * SD_demand^2 + Demand * SD_lead_time^2)^0.5
+    where k is calculated from a CSL target per item. k is only computed once per distinct CSL.
+
+    Inputs:
+        demand_mean, demand_sd, lead_time_mean, lead_time_sd, CSL (np.array) - per item statistics and targets, 
+            scalars apply to every item
+
+    Returns:
+        safety_stocks (np.array) - integer safety stock per item
+    """
+
+    demand_mean, demand_sd, lead_time_mean, lead_time_sd, CSL = np.broadcast_arrays(
+        demand_mean, demand_sd, lead_time_mean, lead_time_sd, CSL)
+
     # find k given a CSL target
-    k = round(stats.norm(0, 1).ppf(CSL),2)
+    targets, target_index = np.unique(CSL, return_inverse=True)
+    k = np.array([u.service_factor(float(target)) for target in targets])[target_index].reshape(CSL.shape)
 
-    # find the reorder point
-    safety_stock = int(k * math.sqrt(lead_time_mean*(demand_mean**2) + demand_mean*(lead_time_sd**2)))
-    print("With average demand {}, SD_demand of {}, average lead time {} and SD_lead_time of {}, the value of k is {} and safety stock is {}".format(demand_mean, demand_sd, lead_time_mean, lead_time_sd, k, safety_stock))
+    safety_stocks = k * np.sqrt(lead_time_mean * demand_sd**2 + demand_mean * lead_time_sd**2)
 
-    return safety_stock
+    return safety_stocks.astype(np.int64)
 
 def find_reorder_point(
         demand_mean: int,
@@ -120,6 +148,129 @@ def find_reorder_point(
     return reorder_point
 
 
+def find_reorder_points(
+        demand_mean: np.array,
+        safety_stock: np.array,
+        lead_time_mean: np.array
+) -> np.array:
+    
+    """
+    The function finds the reorder point (ROP) of a whole catalogue of items in one pass, following the formula:
+    ROP = (Lead Time x Demand Rate) + Safety Stock
+
+    Returns:
+        reorder_points (np.array)
+    """
+
+    return np.asarray(lead_time_mean) * np.asarray(demand_mean) + np.asarray(safety_stock)
+
+
+def check_restrictions(
+        safety_stocks: np.array,
+        reorder_points: np.array,
+        path: str = os.path.join(os.path.dirname(__file__), "..", "data", "restrictions.csv")
+) -> pd.DataFrame:
+    
+    """
+    The function compares safety stocks and reorder points against the restrictions file, 
+    with columns SKU, SS and ROP and a row per SKU in catalogue order.
+
+    Returns:
+        comparison (pd.DataFrame) - the restrictions, the values found and their differences per SKU
+    """
+
+    comparison = pd.read_csv(path)
+    comparison["SS Found"] = np.asarray(safety_stocks)[:len(comparison)]
+    comparison["ROP Found"] = np.asarray(reorder_points)[:len(comparison)]
+    comparison["SS Difference"] = comparison["SS Found"] - comparison["SS"]
+    comparison["ROP Difference"] = comparison["ROP Found"] - comparison["ROP"]
+
+    return comparison
+
+
+def estimate_policy_costs(
+        demand_mean: np.array,
+        demand_sd: np.array,
+        lead_time_mean: float,
+        lead_time_sd: float,
+        starting_inventory: np.array,
+        rop: np.array,
+        review_period: np.array,
+        max_quantity: np.array,
+        time_periods: int,
+        per_item_cost: list,
+        delivery_cost: int,
+        holding_costs: float,
+        stock_out_cost: int
+) -> np.array:
+    
+    """
+    The function estimates the costs simulate_inventory would find for a batch of policies, analytically and in one
+    vectorized pass, so that poor policies can be screened out before they are simulated.
+
+    The first order cycle follows inventory drawn down at the mean demand rate from the starting inventory: the first
+    review below the ROP places an order, and so does every review until it arrives after the mean lead time,
+    since reviews look at the inventory on hand only. Days without stock before the arrival are stock outs. 
+    The rest of the horizon is made of steady cycles in which the same orders are placed from the ROP, the
+    average inventory is the safety stock plus half the cycle's orders and the stock out days per cycle are the 
+    expected shortage (newsvendor loss function) over the lead time and half a review period, divided by the demand rate.
+    Item costs use the price tier of the typical order.
+
+    Inputs:
+        demand_mean, demand_sd (np.array) - demand statistics per SKU, dimensions (skus,)
+        lead_time_mean, lead_time_sd (float) - lead time statistics of the supplier
+        starting_inventory, rop (np.array) - per SKU, dimensions (skus,)
+        review_period, max_quantity (np.array) - per policy and SKU, dimensions (scenarios, skus)
+        time_periods (int), per_item_cost (list), delivery_cost (int), holding_costs (float), stock_out_cost (int) - as in simulate_inventory
+
+    Returns:
+        costs (np.array) - the estimated total cost per policy and SKU, dimensions (scenarios, skus)
+    """
+
+    d = np.maximum(np.asarray(demand_mean, dtype=float), 1e-9)
+    sd = np.asarray(demand_sd, dtype=float)
+    review_period = np.asarray(review_period, dtype=float)
+    max_quantity = np.asarray(max_quantity, dtype=float)
+    rop = np.asarray(rop, dtype=float)
+    start = np.asarray(starting_inventory, dtype=float)
+    lead_time = np.rint(lead_time_mean)
+
+    # first cycle: the first review with inventory below the ROP and the reviews until the order arrives
+    below_rop = np.where(start < rop, 0, np.floor((start - rop) / d) + 1)
+    first_review = np.ceil(below_rop / review_period) * review_period
+    arrival = np.minimum(first_review + lead_time + 1, time_periods)
+    first_orders = np.where(first_review < time_periods, np.ceil((arrival - first_review) / review_period), 0)
+    first_ordered = first_orders * (max_quantity - start + d * first_review) + d * review_period * first_orders * (first_orders - 1) / 2
+    
+    # stock outs and inventory held until the arrival
+    empty = np.floor(start / d) + 1
+    first_stock_outs = np.maximum(arrival - empty, 0)
+    held = np.minimum(arrival, start / d)
+    first_holding = start * held - d * held**2 / 2
+
+    # steady cycles for the rest of the horizon
+    orders_per_cycle = np.ceil((lead_time + 1) / review_period)
+    ordered_per_cycle = (orders_per_cycle * (np.maximum(max_quantity - rop, 0) + d * review_period / 2) 
+                         + d * review_period * orders_per_cycle * (orders_per_cycle - 1) / 2)
+    cycles = (time_periods - arrival) * d / np.maximum(ordered_per_cycle, d)
+
+    protection = lead_time_mean + review_period / 2
+    protection_sd = np.maximum(np.sqrt(protection * sd**2 + d**2 * lead_time_sd**2), 1e-9)
+    z = (rop - d * protection) / protection_sd
+    shortage = protection_sd * (norm.pdf(z) - z * norm.sf(z))
+    steady_stock_outs = np.minimum(cycles * shortage / d, time_periods - arrival)
+    steady_holding = (time_periods - arrival) * (np.maximum(rop - d * protection, 0) + ordered_per_cycle / 2)
+
+    nr_orders = first_orders + cycles * orders_per_cycle
+    ordered = first_ordered + cycles * ordered_per_cycle
+    order_size = np.rint(ordered / np.maximum(nr_orders, 1)).astype(np.int64)
+    item_price = u.lookup_breakpoints(u.compile_price_tiers(per_item_cost), np.arange(len(per_item_cost)), order_size)
+
+    return ((first_holding + steady_holding) * holding_costs
+            + nr_orders * delivery_cost + ordered * item_price
+            + (first_stock_outs + steady_stock_outs) * stock_out_cost)
+
+
 def generate_inventory(
         demand: list, 
         reorder_point: int,
@@ -192,6 +343,150 @@ def cost_function(
     return costs
 
 
+def simulate_inventory(
+        demand: np.array,
+        starting_inventory: np.array,
+        rop: np.array,
+        review_period: np.array,
+        max_quantity: np.array,
+        lead_times: np.array,
+        per_item_cost: list,
+        delivery_cost: int,
+        holding_costs: float,
+        stock_out_cost: int
+) -> dict:
+
+    """
+    The function simulates a batch of inventory scenarios for the SKUs delivered by one supplier.
+    All scenarios are stepped through time together, inventory and pipeline orders are kept as (scenarios, skus) arrays.
+
+    Inputs:
+        demand (np.array) - demand per SKU and time period, dimensions (skus, time_periods)
+        starting_inventory (np.array) - starting inventory per SKU, dimensions (skus,)
+        rop (np.array) - reorder point per SKU, dimensions (skus,)
+        review_period (np.array) - review period per scenario and SKU, dimensions (scenarios, skus)
+        max_quantity (np.array) - order-up-to quantity per scenario and SKU, dimensions (scenarios, skus)
+        lead_times (np.array) - lead time of an order placed with the supplier per scenario and time period, dimensions (scenarios, time_periods)
+        per_item_cost (list) - price tiers [min_order, max_order, price] per SKU
+        delivery_cost (int) - constant cost per delivery
+        holding_costs (float) - holding cost per item per time period
+        stock_out_cost (int) - cost per SKU and time period with a stock out
+
+    Returns:
+        results (dict) - arrays with dimensions (scenarios, time_periods, skus) for the keys
+                         "Inventory", "Ordered", "Lead Time", "Carryover Cost", "Delivery Cost", "Stockout Costs" and "Total Costs"
+    """
+
+    demand = np.asarray(demand, dtype=np.int64)
+    review_period = np.asarray(review_period, dtype=np.int64)
+    max_quantity = np.asarray(max_quantity, dtype=np.int64)
+    lead_times = np.asarray(lead_times, dtype=np.int64)
+    rop = np.asarray(rop)
+
+    nr_skus, time_periods = demand.shape
+    nr_scenarios = review_period.shape[0]
+    scenarios = np.arange(nr_scenarios)
+    sku_index = np.arange(nr_skus)
+    price_tiers = u.compile_price_tiers(per_item_cost)
+
+    shape = (nr_scenarios, time_periods, nr_skus)
+    results = {
+        "Inventory": np.empty(shape, dtype=np.int64),
+        "Ordered": np.empty(shape, dtype=np.int64),
+        "Lead Time": np.empty(shape, dtype=np.int64),
+        "Carryover Cost": np.empty(shape, dtype=float),
+        "Delivery Cost": np.empty(shape, dtype=float),
+        "Stockout Costs": np.empty(shape, dtype=float),
+        "Total Costs": np.empty(shape, dtype=float),
+    }
+
+    inventory = np.tile(np.asarray(starting_inventory, dtype=np.int64), (nr_scenarios, 1))
+    # deliveries are scheduled by arrival time period, orders arriving after the last period are never received
+    arrivals = np.zeros((nr_scenarios, time_periods + lead_times.max(initial=0) + 1, nr_skus), dtype=np.int64)
+
+    for t in range(time_periods):
+
+        # reorder if it's review day and inventory is below ROP
+        ordered = (t % review_period == 0) & (inventory < rop)
+        order = np.where(ordered, max_quantity - inventory, 0)
+
+        # the first SKU ordered from the supplier on a given day pays for the delivery,
+        # all SKUs ordered on that day share its lead time
+        nr_ordered = np.cumsum(ordered, axis=1)
+        first_order = ordered & (nr_ordered == 1)
+        order_lead_time = np.where(nr_ordered > 0, lead_times[:, t:t+1], 0)
+
+        # find delivery cost respective or order size items
+        sku_cost = u.lookup_breakpoints(price_tiers, sku_index, order)
+
+        # has there been a stock out?
+        stock_out = inventory < 0
+
+        carry_over_costs = np.where(stock_out, 0, inventory) * holding_costs
+        delivery_costs = first_order * delivery_cost + ordered * sku_cost * order
+        stock_out_costs = stock_out * stock_out_cost
+
+        # inventory is recorded at the beginning of the day (following a delivery (if any))
+        # demand_t will affect inventory_t+1
+        results["Inventory"][:, t] = inventory
+        results["Ordered"][:, t] = order
+        results["Lead Time"][:, t] = order_lead_time
+        results["Carryover Cost"][:, t] = carry_over_costs
+        results["Delivery Cost"][:, t] = delivery_costs
+        results["Stockout Costs"][:, t] = stock_out_costs
+        results["Total Costs"][:, t] = carry_over_costs + delivery_costs + stock_out_costs
+
+        # schedule the orders, each scenario places at most one order per SKU a day
+        arrivals[scenarios, t + lead_times[:, t]] += order
+
+        # find next day's inventory
+        inventory = inventory - demand[:, t] + arrivals[:, t]
+
+    return results
+
+
+def summarize_simulations(
+        sim_results: ResultBuffer.ResultBuffer,
+        broadcast: bool = False
+):
+    
+    """
+    The function aggregates simulation results per simulation in a single pass over the result arrays:
+    total cost, its rank, whether the simulation stocked out and the average lead time of the orders.
+
+    Inputs:
+        sim_results (ResultBuffer) - the results returned by inventory_sim
+        broadcast (bool) - whether to also return the results with the aggregates of their simulation on every row
+
+    Returns:
+        summary (pd.DataFrame) - a row per simulation, see SimulationSummary.to_frame
+        df_output (pd.DataFrame) - if broadcast, the results with the columns "Did Stock Out", "Total Costs By Sim",
+                                   "Rank Based on Cost" and "Average Lead Time Sim"
+    """
+
+    columns = {name: column[:sim_results.size] for name, column in sim_results.columns.items()}
+    aggregates = SimulationSummary.SimulationSummary()
+    aggregates.update(columns["Simulation"], columns["Total Costs"], columns["Stockout Costs"], columns["Lead Time"])
+    summary = aggregates.to_frame()
+
+    if not broadcast:
+        return summary
+
+    # position of each row's simulation in the summary
+    position = np.searchsorted(summary["Simulation"].to_numpy(), columns["Simulation"])
+    df_output = sim_results.to_frame()
+    for name in ("Did Stock Out", "Total Costs By Sim", "Rank Based on Cost", "Average Lead Time Sim"):
+        df_output[name] = summary[name].to_numpy()[position]
+
+    return summary, df_output
+
+
+# columns of the simulation results written by inventory_sim
+results_columns = {"SKU": np.int64, "Period": np.int64, "Simulation": np.int64, "Supplier": np.int64,
+                   "Demand": np.int64, "Inventory": np.int64, "Ordered": np.int64, "Lead Time": np.int64,
+                   "Carryover Cost": float, "Delivery Cost": float, "Stockout Costs": float, "Total Costs": float}
+
+
 def inventory_sim(
         simulations: int,
         time_periods: int,
@@ -207,21 +502,40 @@ def inventory_sim(
         lead_time: list = np.array(halfnorm.rvs(loc = 3, scale = 3, size=50), dtype=int),
         review_period: list = np.arange(2, 30, 1),
         max_quantity: list = np.arange(4000, 20000, 500),
+        crn: bool = False,
+        results_writer = None,
+        keep_fraction: float = 1.0,
+        batch_size: int = 1000,
 
-) -> dict:
+) -> tuple:
     
     """
     The function runs a simulation of an SKU inventory given some demand and assuming the specified policy.
+    For each supplier, simulations x simulations scenarios are generated: a policy type and max quantity per SKU
+    is drawn for every outer simulation and a review period per SKU for every inner one. The random draws,
+    including the lead time of every potential order, are sampled up front and all scenarios are simulated 
+    together by simulate_inventory.
+
+    With crn (common random numbers), the lead times are sampled once per supplier and time period and shared by all 
+    the scenarios, so scenarios differ only in their policies and fewer of them are needed to rank the policies.
+
+    With a results_writer (a ResultWriter created with results_columns), the results of each supplier are written
+    to disk as soon as they are simulated instead of being kept in memory.
+    The scenarios of a supplier are simulated and written batch_size at a time, so with a writer the peak memory 
+    depends on the batch size rather than on the number of simulations.
+
+    With a keep_fraction below 1, the costs of every scenario are first estimated analytically (see 
+    estimate_policy_costs) and only that fraction of the scenarios, the ones with the lowest estimated costs
+    across the suppliers, is simulated. The results keep the original simulation numbers.
 
     Returns:
-        sim_results (dict) - a nested dictionary 
+        sim_results (ResultBuffer or ResultWriter) - a row per supplier, simulation, time period and SKU
+        sim_config (ResultBuffer) - a row per simulation and SKU
     """
     
-    sim_results = {} # simulation results
-    sim_config = {} # simulation configuration
  
    # randomly assign SKUs to suppliers
-    SKUs_per_supplier = [[] for sup in range(2)]
+    SKUs_per_supplier = [[] for sup in range(nr_suppliers)]
     SKUs = np.arange(0,nr_SKUs,1)
     random.shuffle(SKUs)
     while len(SKUs) > 0:
@@ -230,138 +544,128 @@ def inventory_sim(
                 SKUs_per_supplier[sup].append(SKUs[0])
                 SKUs = np.delete(SKUs, [0])
 
-    for supplier in range(nr_suppliers):    
-    
-        for s0 in range(simulations):
-            # delivery arrival time period and size, there might be several deliveries in the pipeline, hence a list is used
-            t_arrival = []
-            delivery_size = []
-            policy_types = ["periodic", "continuous"]
-            # select a policy per SKU
-            sku_policies = [policy_types[np.random.randint(0,2)] for i in range(nr_SKUs)]
-            # select max quantity per sku
-            sku_max_quantities = [random.choice(max_quantity) for i in range(nr_SKUs)]
-
-            for i in range(nr_SKUs):
-                t_arrival.append([])
-                delivery_size.append([])
-            
-            for s1 in range(simulations):
-                inventory = starting_inventory.copy()
-                sku_review_period = []
-                # find a random review period for SKUs with periodic review policy
-                for j in range(nr_SKUs):
-                    if sku_policies[j] == policy_types[0]:
-                        sku_review_period.append(random.choice(review_period))
-                    else:
-                        sku_review_period.append(1)
-            
-                
-                for t in range(time_periods):
-                    
-                    already_ordered = False
-                    order_lead_time = 0
-                    
-                    for sku in SKUs_per_supplier[supplier]:
-                        d1 = 0
-                        d2 = 0
-                        s = 0
-                        i = 1
-                        sku_cost = 0
-                        order = 0 # order size 
-                        
-                        # is it review day?
-                        if t%sku_review_period[sku] == 0:
-
-                            # reorder if inventory below ROP
-                            if inventory[sku] < rop[sku]:
-
-                                d1 = 0 if already_ordered else 1 # check if delivery costs need to be accounted for
-                                d2 = 1 # indicate an order took place
-            
-                                # find order size
-                                order = sku_max_quantities[sku] - inventory[sku]
-                                
-                                if not already_ordered:
-                                    order_lead_time = random.choice(lead_time)
-                                    already_ordered = True
-    
-                                t_arrival[sku].append(t + order_lead_time) # order arrival time period
-                                delivery_size[sku].append(order) 
-
-                                                        # find delivery cost respective or order size items
-                                for c in per_item_cost[sku]:
-                                    if order in range(c[0], c[1]):
-                                        sku_cost = c[2]
-                                        break
-
-                        # has there been a stock out?
-                        if inventory[sku] < 0:
-                                s = 1 # indicate there was a stock out
-                                i = 0 # indicate there's no stock
-
-                        # find the cost 
-                        cost = cost_function(
-                                                i=i, 
-                                                inventory=inventory[sku],
-                                                per_item_cost=sku_cost,
-                                                holding_costs=holding_costs,
-                                                d1=d1,
-                                                d2=d2,
-                                                order_size=order,
-                                                delivery_cost=delivery_cost,
-                                                s=s,
-                                                stock_out_cost=stock_out_cost)
-            
-                        # save the results 
-                        # inventory is recorded at the beginning of the day (following a delivery (if any)) 
-                        # demand_t will affect inventory_t+1
-                        sim_results["sup_"+str(supplier)+ "_s_" + str(s0*simulations + s1) + "_t_" + str(t) + "_sku_"+str(sku)] = {
-                            "ID": str(sku) + "_" + str(s0*simulations + s1),
-                            "SKU": sku,
-                            "Period": t,
-                            "Simulation": (s0*simulations + s1),
-                            "Supplier": supplier,
-                            "Demand": demand[sku][t],
-                            "Inventory": inventory[sku],
-                            "Ordered": order,
-                            "Lead Time": order_lead_time,
-                            "Carryover Cost": cost["Carryover Cost"],
-                            "Delivery Cost": cost["Delivery Cost"],
-                            "Stockout Costs": cost["Stockout Costs"],
-                            "Total Costs": cost["Total Costs"],
-                        }
-                        if t == 0:
-                            sim_config["sup_"+str(supplier) + "_s_" + str(s0*simulations + s1) + "_sku_"+str(sku)]  = {
-                                "ID": str(sku) + "_" + str(s0*simulations + s1),
-                                "Simulation": (s0*simulations + s1),
-                                "SKU": sku,
-                                "Time Periods": time_periods,
-                                "Max Quantity": sku_max_quantities[sku],
-                                "Review Period": sku_review_period[sku],
-                                "Starting Inventory": starting_inventory[sku],
-                                "ROP": rop[sku],
-                                "Lead Time": order_lead_time,
-                                "Policy Type":sku_policies[sku] 
-                            }  
-            
-                        # find next day's inventory
-                        # is it delivery day?
-                        if t in t_arrival[sku]:    
-                            while t in t_arrival[sku]:
-                                index = t_arrival[sku].index(t)
-                                inventory[sku] = inventory[sku] - demand[sku][t] + delivery_size[sku][index]
-                                # remove from the list 
-                                t_arrival[sku].pop(index)
-                                delivery_size[sku].pop(index)
-                        
-                        else:
-                            inventory[sku] = inventory[sku] - demand[sku][t]
-                        
-                print("Simulation {} complete.".format((s0*simulations + s1)))
+    demand = np.asarray(demand)
+    starting_inventory = np.asarray(starting_inventory)
+    rop = np.asarray(rop)
+    policy_types = ["periodic", "continuous"]
+    nr_scenarios = simulations * simulations
 
-    return sim_results, sim_config
+    # lead time of an order placed with a supplier on a given day, shared by all scenarios
+    if crn:
+        common_lead_times = np.random.choice(lead_time, size=(nr_suppliers, time_periods))
+
+    # draw the scenarios of every supplier up front, so they can be screened before simulating any of them
+    configs = []
+    for supplier in range(nr_suppliers):    
 
+        # select a policy and max quantity per SKU for each outer simulation
+        sku_policies = np.random.randint(0, 2, size=(simulations, nr_SKUs))
+        sku_max_quantities = np.random.choice(max_quantity, size=(simulations, nr_SKUs))
+        # find a random review period for SKUs with periodic review policy for each inner simulation
+        sku_review_period = np.where(sku_policies[:, None, :] == 0,
+                                     np.random.choice(review_period, size=(simulations, simulations, nr_SKUs)),
+                                     1).reshape(nr_scenarios, nr_SKUs)
+        sku_policies = np.repeat(sku_policies, simulations, axis=0)
+        sku_max_quantities = np.repeat(sku_max_quantities, simulations, axis=0)
+        # lead time of an order placed on a given day
+        if crn:
+            order_lead_times = np.broadcast_to(common_lead_times[supplier], (nr_scenarios, time_periods))
+        else:
+            order_lead_times = np.random.choice(lead_time, size=(nr_scenarios, time_periods))
+
+        configs.append((sku_policies, sku_max_quantities, sku_review_period, order_lead_times))
+
+    # keep the scenarios with the lowest estimated costs
+    scenarios = np.arange(nr_scenarios)
+    if keep_fraction < 1:
+        estimated_costs = np.zeros(nr_scenarios)
+        for supplier, (_, sku_max_quantities, sku_review_period, _) in enumerate(configs):
+            skus = np.asarray(SKUs_per_supplier[supplier], dtype=int)
+            estimated_costs += estimate_policy_costs(
+                                demand_mean=demand[skus].mean(axis=1),
+                                demand_sd=demand[skus].std(axis=1),
+                                lead_time_mean=np.mean(lead_time),
+                                lead_time_sd=np.std(lead_time),
+                                starting_inventory=starting_inventory[skus],
+                                rop=rop[skus],
+                                review_period=sku_review_period[:, skus],
+                                max_quantity=sku_max_quantities[:, skus],
+                                time_periods=time_periods,
+                                per_item_cost=[per_item_cost[sku] for sku in skus],
+                                delivery_cost=delivery_cost,
+                                holding_costs=holding_costs,
+                                stock_out_cost=stock_out_cost).sum(axis=1)
+        nr_kept = max(int(np.ceil(keep_fraction * nr_scenarios)), 1)
+        scenarios = np.sort(np.argpartition(estimated_costs, nr_kept - 1)[:nr_kept])
+    nr_kept = len(scenarios)
+
+    # simulation results
+    if results_writer is not None:
+        sim_results = results_writer
+    else:
+        sim_results = ResultBuffer.ResultBuffer(
+            nr_rows=nr_kept * time_periods * nr_SKUs,
+            columns=results_columns,
+            id_columns=("SKU", "Simulation"))
+    # simulation configuration
+    sim_config = ResultBuffer.ResultBuffer(
+        nr_rows=nr_kept * nr_SKUs,
+        columns={"Simulation": np.int64, "SKU": np.int64, "Time Periods": np.int64, "Max Quantity": np.int64,
+                 "Review Period": np.int64, "Starting Inventory": np.int64, "ROP": np.int64, "Lead Time": np.int64,
+                 "Policy Type": np.int8},
+        categories={"Policy Type": policy_types},
+        id_columns=("SKU", "Simulation"))
 
+    for supplier in range(nr_suppliers):    
 
+        skus = np.asarray(SKUs_per_supplier[supplier], dtype=int)
+
+        for start in range(0, nr_kept, batch_size):
+            batch = scenarios[start:start + batch_size]
+            sku_policies, sku_max_quantities, sku_review_period, order_lead_times = (
+                config[batch] for config in configs[supplier])
+
+            results = simulate_inventory(
+                                    demand=demand[skus],
+                                    starting_inventory=starting_inventory[skus],
+                                    rop=rop[skus],
+                                    review_period=sku_review_period[:, skus],
+                                    max_quantity=sku_max_quantities[:, skus],
+                                    lead_times=order_lead_times,
+                                    per_item_cost=[per_item_cost[sku] for sku in skus],
+                                    delivery_cost=delivery_cost,
+                                    holding_costs=holding_costs,
+                                    stock_out_cost=stock_out_cost)
+
+            # save the results 
+            # inventory is recorded at the beginning of the day (following a delivery (if any)) 
+            # demand_t will affect inventory_t+1
+            sim_results.append({
+                "SKU": skus,
+                "Period": np.arange(time_periods)[:, None],
+                "Simulation": batch[:, None, None],
+                "Supplier": supplier,
+                "Demand": demand[skus].T,
+                "Inventory": results["Inventory"],
+                "Ordered": results["Ordered"],
+                "Lead Time": results["Lead Time"],
+                "Carryover Cost": results["Carryover Cost"],
+                "Delivery Cost": results["Delivery Cost"],
+                "Stockout Costs": results["Stockout Costs"],
+                "Total Costs": results["Total Costs"],
+            })
+            sim_config.append({
+                "Simulation": batch[:, None],
+                "SKU": skus,
+                "Time Periods": time_periods,
+                "Max Quantity": sku_max_quantities[:, skus],
+                "Review Period": sku_review_period[:, skus],
+                "Starting Inventory": starting_inventory[skus],
+                "ROP": rop[skus],
+                "Lead Time": results["Lead Time"][:, 0],
+                "Policy Type": sku_policies[:, skus],
+            })
+
+        print("Supplier {}: {} simulations complete.".format(supplier, nr_kept))
 
+    return sim_results, sim_config
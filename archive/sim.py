@@ -1,8 +1,8 @@
 import funcs
+import ResultWriter
 import random
 import numpy as np
 import configparser
-import pandas as pd
 
 # import global varibale from a config file
 config = configparser.ConfigParser()
@@ -22,14 +22,15 @@ delivery_cost = int(global_variables['delivery_cost']) # constant per delivery
 stock_out_cost = int(global_variables['stock_out_cost'])
 per_item_cost = int(global_variables['per_item_cost'])
 time_periods = int(global_variables['time_periods'])
+# write simulation results to disk as they are produced instead of keeping them in memory
+stream_results = global_variables.getboolean('stream_results', fallback=False)
+# fraction of the scenarios simulated, the rest are screened out by their estimated costs
+keep_fraction = global_variables.getfloat('keep_fraction', fallback=1.0)
 
 # define demand mean/ sd based on the number of SKUs
 demand_mean = [random.randint(300, 600) for i in range(nr_SKUs)]
 demand_sd = [random.randint(50, 100) for i in range(nr_SKUs)]
 
-sim_results = {} # simulation results will go here
-sim_config = {} # simulation configuration data will go here
-
 # generate demand per SKU
 demand = funcs.generate_demand(
     nr_SKUs=nr_SKUs,
@@ -40,21 +41,24 @@ demand = funcs.generate_demand(
     demand_sd=demand_sd
 )
 
-safety_stocks = np.asarray([funcs.find_safety_stock( 
-                          demand_mean=demand_mean[i],
-                          demand_sd=demand_sd[i],
-                          lead_time_mean=lead_time_mean[i%2], # even SKUs delivered by suppplier 1 (index = 0), odd SKUs delivered by supplier 2 (index = 1)
-                          lead_time_sd=lead_time_sd[i%2]  
-                        ) for i in range(nr_SKUs)])
+# even SKUs delivered by suppplier 1 (index = 0), odd SKUs delivered by supplier 2 (index = 1)
+sku_supplier = np.arange(nr_SKUs) % 2
+
+safety_stocks = funcs.find_safety_stocks( 
+                          demand_mean=demand_mean,
+                          demand_sd=demand_sd,
+                          lead_time_mean=lead_time_mean[sku_supplier],
+                          lead_time_sd=lead_time_sd[sku_supplier]  
+                        )
 
-rop = np.asarray([funcs.find_reorder_point(
-                    demand_mean=demand_mean[i],
-                    safety_stock=safety_stocks[i],
-                    lead_time_mean=lead_time_mean[i%2]
-                    ) for i in range(nr_SKUs)])
+rop = funcs.find_reorder_points(
+                    demand_mean=demand_mean,
+                    safety_stock=safety_stocks,
+                    lead_time_mean=lead_time_mean[sku_supplier]
+                    )
 
 # assume starting inventory is 3 times the reorder point
-starting_inventory = np.asarray([rop[i] * 2 for i in range(nr_SKUs)])
+starting_inventory = rop * 2
 
 # sampling population for the periodic review policy
 periodic_review_periods = np.arange(1,90,1)
@@ -80,29 +84,18 @@ sim_results, sim_config = funcs.inventory_sim(
         holding_costs = 0.9,
         stock_out_cost = 1000000,
         demand=demand,
+        results_writer=ResultWriter.ResultWriter('data/sim_results.csv', funcs.results_columns, id_columns=("SKU", "Simulation")) if stream_results else None,
+        keep_fraction=keep_fraction,
 )
 
-df_output = pd.DataFrame.from_dict(sim_results,orient='index') # simulation results will go here
-df_config = pd.DataFrame.from_dict(sim_config,orient='index') # simulation configuration data will go here
-
-df_total_cost_by_sim = df_output.groupby("Simulation", as_index=False)["Total Costs"].sum()
-df_total_cost_by_sim["Rank Based on Cost"] = df_total_cost_by_sim["Total Costs"].rank(ascending=True)
-df_total_cost_by_sim = df_total_cost_by_sim.rename(columns={"Total Costs": "Total Costs By Sim"})
-
-df_stockout = df_output.groupby("Simulation", as_index=False)["Stockout Costs"].sum()
-df_stockout["Did Stock Out"] = df_stockout["Stockout Costs"].apply(lambda x: True if x > 0 else False)
-df_stockout = df_stockout.drop(columns=["Stockout Costs"])
-
-df_output["Lead Time Nan"] = df_output["Lead Time"].apply(lambda x: np.NaN if x == 0 else x)
-df_lead_time = df_output.groupby("Simulation", as_index=False)["Lead Time Nan"].mean()
-df_lead_time = df_lead_time.rename(columns={"Lead Time Nan": "Average Lead Time Sim"})
-
-df_output = df_output.drop(columns=["Lead Time Nan"])
-df_output = pd.merge(df_output, df_stockout, how="left", on="Simulation")
-df_output = pd.merge(df_output, df_total_cost_by_sim, how="left", on="Simulation")
-df_output = pd.merge(df_output, df_lead_time, how="left", on="Simulation")
-#print(df_output)
-
-df_output.to_csv('data/sim_results.csv', index=False)
+df_config = sim_config.to_frame() # simulation configuration data will go here
 df_config.to_csv('data/sim_config.csv', index=False)
 
+if stream_results:
+    # the rows are already on disk, the per-simulation aggregates go to a separate file
+    sim_results.close().to_csv('data/sim_summary.csv', index=False)
+else:
+    df_summary, df_output = funcs.summarize_simulations(sim_results, broadcast=True)
+
+    df_output.to_csv('data/sim_results.csv', index=False)
+    df_summary.to_csv('data/sim_summary.csv', index=False)
@@ -0,0 +1,293 @@
+"""Throughput and memory benchmarks of the simulator, the demand generator and the genetic algorithm.
+
+Every combination of the parameters given on the command line is a case, run in a fresh process so that its peak
+resident memory is its own. Parameters default to the values in sim.config, and the demand of the simulated SKUs
+is drawn around the mean and standard deviation of the SKUs in data/full_dataset.csv, so the same arguments always
+give the same workload. Results are saved as JSON and can be compared with an earlier run:
+
+    python benchmarks/bench.py --skus 5 50 --horizon 30 90 --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import itertools
+import subprocess
+import contextlib
+import configparser
+import tracemalloc
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError: # not available on Windows, peak RSS is then not reported
+    resource = None
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path[:0] = [os.path.join(ROOT, "src"), os.path.join(ROOT, "archive")]
+
+import funcs
+import GA_core as ga_opt
+import supply_chain as sc
+from utilities import Demand_Factory
+
+SUITES = ["sim", "demand", "ga"]
+
+# price tiers [min_order, max_order, price] of every SKU, as in sim.py
+PRICE_TIERS = [[0, 50, 0.9], [51, 120, 0.7], [121, 1000000, 0.6]]
+
+
+def load_config(path: str = os.path.join(ROOT, "sim.config")) -> dict:
+    """Reads the simulation settings used as benchmark defaults.
+
+    Args:
+        path (str, optional): the config file. Defaults to sim.config in the repository root.
+
+    Returns:
+        dict: the settings, converted to numbers
+    """
+    config = configparser.ConfigParser()
+    config.read(path)
+    settings = config["global"]
+
+    return {"skus": int(settings["nr_SKUs"]),
+            "suppliers": int(settings["nr_suppliers"]),
+            "horizon": int(settings["time_periods"]),
+            "sims": int(settings["nr_sims"]),
+            # one digit per supplier, as read by sim.py
+            "lead_time_mean": np.array(list(settings["lead_time_mean"]), dtype=int),
+            "lead_time_sd": np.array(list(settings["lead_time_sd"]), dtype=int),
+            "holding_costs": float(settings["holding_costs"]),
+            "delivery_cost": int(settings["delivery_cost"]),
+            "stock_out_cost": int(settings["stock_out_cost"]),
+            "per_item_cost": int(settings["per_item_cost"])}
+
+
+def load_demand_stats(nr_skus: int,
+                      path: str = os.path.join(ROOT, "data", "full_dataset.csv")) -> tuple:
+    """Finds the demand mean and standard deviation of the SKUs in the dataset, repeated to the number of SKUs.
+
+    Args:
+        nr_skus (int): the number of SKUs
+        path (str, optional): the dataset. Defaults to data/full_dataset.csv.
+
+    Returns:
+        tuple: demand mean and standard deviation per SKU, and starting inventory per SKU
+    """
+    dataset = pd.read_csv(path)
+    demand = dataset.filter(regex=r"^SKU_\d+$").to_numpy(dtype=float)
+    inventory = dataset.filter(regex=r"^SKU_inventory_\d+$").to_numpy()[0]
+    sku = np.arange(nr_skus) % demand.shape[1]
+
+    return demand.mean(axis=0)[sku], demand.std(axis=0)[sku], inventory[sku]
+
+
+def bench_sim(params: dict, config: dict, repeat: int) -> dict:
+
+    mean, sd, _ = load_demand_stats(params["skus"])
+    rng = np.random.default_rng(params["seed"])
+    demand = np.maximum(rng.normal(mean[:, None], sd[:, None], (params["skus"], params["horizon"])), 0).astype(int)
+
+    sku_supplier = np.arange(params["skus"]) % len(config["lead_time_mean"])
+    safety_stocks = funcs.find_safety_stocks(mean, sd, config["lead_time_mean"][sku_supplier], config["lead_time_sd"][sku_supplier])
+    rop = funcs.find_reorder_points(mean, safety_stocks, config["lead_time_mean"][sku_supplier]).astype(int)
+
+    def run():
+        random.seed(params["seed"])
+        np.random.seed(params["seed"])
+        with contextlib.redirect_stdout(None):
+            funcs.inventory_sim(simulations=params["sims"],
+                                time_periods=params["horizon"],
+                                nr_SKUs=params["skus"],
+                                nr_suppliers=params["suppliers"],
+                                starting_inventory=rop * 2,
+                                rop=rop,
+                                delivery_cost=config["delivery_cost"],
+                                per_item_cost=[PRICE_TIERS] * params["skus"],
+                                holding_costs=config["holding_costs"],
+                                stock_out_cost=config["stock_out_cost"],
+                                demand=demand,
+                                lead_time=np.arange(2, 14, 1))
+
+    seconds, memory = measure(run, repeat)
+    # each supplier simulates sims x sims scenarios
+    scenarios = params["sims"]**2 * params["suppliers"]
+
+    return {"seconds": seconds, "scenarios_per_sec": scenarios / seconds, **memory}
+
+
+def bench_demand(params: dict, config: dict, repeat: int) -> dict:
+
+    def run():
+        split = [params["skus"] // 3, params["skus"] // 3, params["skus"] - 2 * (params["skus"] // 3)]
+        Demand_Factory(params["horizon"], seed=params["seed"]).generate(params["skus"], split, ["random", "trend", "seasonal"])
+
+    seconds, memory = measure(run, repeat)
+
+    return {"seconds": seconds, "skus_per_sec": params["skus"] / seconds, **memory}
+
+
+def bench_ga(params: dict, config: dict, repeat: int) -> dict:
+
+    mean, _, inventory = load_demand_stats(params["skus"])
+    demand = np.random.default_rng(params["seed"]).poisson(mean[:, None], (params["sims"], params["skus"], params["horizon"]))
+    lead_time = config["lead_time_mean"][np.arange(params["skus"]) % len(config["lead_time_mean"])]
+    skus = [sc.SKU("sku_" + str(i), int(inventory[i]), int(lead_time[i]), int(2 * inventory[i])) for i in range(params["skus"])]
+    evaluator = sc.Fitness_Evaluator(skus=skus,
+                                     demand=demand,
+                                     holding_cost=config["holding_costs"],
+                                     delivery_cost=config["delivery_cost"],
+                                     stock_out_cost=config["stock_out_cost"],
+                                     per_item_cost=config["per_item_cost"],
+                                     suppliers=list(np.arange(params["skus"]) % params["suppliers"]))
+
+    def run():
+        optimizer = ga_opt.Genetic_Algorithm(fitness_func=evaluator, seed=params["seed"])
+        optimizer.create_population(size=params["population"], skus=skus)
+        optimizer.run_genetic(generations=params["generations"])
+
+    seconds, memory = measure(run, repeat)
+
+    return {"seconds": seconds, "generations_per_sec": params["generations"] / seconds, **memory}
+
+
+def measure(run, repeat: int) -> tuple:
+    """Times a workload and measures its memory use.
+
+    Args:
+        run (callable): the workload
+        repeat (int): the number of timed runs, the fastest one is reported
+
+    Returns:
+        tuple: the fastest time in seconds, and a dict with the peak RSS of the process, the peak memory traced by
+               tracemalloc and the number of memory blocks still live when the workload returns
+    """
+    seconds = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    # a separate run, tracing slows the workload down
+    tracemalloc.start()
+    run()
+    snapshot = tracemalloc.take_snapshot()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    memory = {"traced_peak_mb": traced_peak / 2**20,
+              "live_blocks": sum(stat.count for stat in snapshot.statistics("filename")),
+              "peak_rss_mb": None}
+    if resource is not None:
+        # kilobytes on Linux, bytes on macOS
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        memory["peak_rss_mb"] = peak_rss / (2**20 if sys.platform == "darwin" else 2**10)
+
+    return seconds, memory
+
+
+def run_case(case: dict) -> dict:
+    """Runs one case, in the process it is called from.
+
+    Args:
+        case (dict): "suite", "params", "config" and "repeat"
+
+    Returns:
+        dict: the suite, its parameters and the measurements
+    """
+    bench = {"sim": bench_sim, "demand": bench_demand, "ga": bench_ga}[case["suite"]]
+
+    return {"suite": case["suite"], "params": case["params"], **bench(case["params"], case["config"], case["repeat"])}
+
+
+def cases(args, config: dict):
+    """Yields the cases of the suites selected, a case per combination of the parameters the suite uses.
+    """
+    used = {"sim": ["skus", "suppliers", "horizon", "sims"],
+            "demand": ["skus", "horizon"],
+            "ga": ["skus", "suppliers", "horizon", "sims", "population", "generations"]}
+
+    for suite in args.suite:
+        names = used[suite]
+        for values in itertools.product(*(getattr(args, name) for name in names)):
+            params = dict(zip(names, values), seed=args.seed)
+            yield {"suite": suite, "params": params, "config": config, "repeat": args.repeat}
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """Prints the change in time and memory of every case also found in an earlier run.
+
+    Args:
+        results (list): the results of this run
+        baseline_path (str): the JSON file of the earlier run
+    """
+    with open(baseline_path) as file:
+        baseline = {json.dumps([r["suite"], r["params"]], sort_keys=True): r for r in json.load(file)["results"]}
+
+    for result in results:
+        before = baseline.get(json.dumps([result["suite"], result["params"]], sort_keys=True))
+        if before is None:
+            continue
+        print("{:<6} {:<70} time x{:.2f}  traced peak x{:.2f}".format(
+            result["suite"], str(result["params"]),
+            result["seconds"] / before["seconds"],
+            result["traced_peak_mb"] / max(before["traced_peak_mb"], 1e-9)))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+
+    config = load_config()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", nargs="+", choices=SUITES, default=SUITES, help="the benchmarks to run")
+    parser.add_argument("--skus", nargs="+", type=int, default=[config["skus"]])
+    parser.add_argument("--suppliers", nargs="+", type=int, default=[config["suppliers"]])
+    parser.add_argument("--horizon", nargs="+", type=int, default=[config["horizon"]], help="time periods simulated")
+    parser.add_argument("--sims", nargs="+", type=int, default=[config["sims"]],
+                        help="simulations of inventory_sim (sims x sims scenarios per supplier), demand scenarios of the GA")
+    parser.add_argument("--population", nargs="+", type=int, default=[100])
+    parser.add_argument("--generations", nargs="+", type=int, default=[10])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results.json"),
+                        help="the results file, benchmarks/results.json (ignored by git) by default")
+    parser.add_argument("--compare", help="an earlier results file to compare with")
+    args = parser.parse_args()
+
+    results = []
+    # a fresh process per case, so the peak RSS is the case's own
+    context = multiprocessing.get_context("spawn")
+    for case in cases(args, config):
+        with context.Pool(1) as pool:
+            result = pool.apply(run_case, (case,))
+        results.append(result)
+        rate = next(value for name, value in result.items() if name.endswith("_per_sec"))
+        print("{:<6} {:<70} {:>10.3f}s {:>12.1f}/s  peak RSS {} MB".format(
+            result["suite"], str(result["params"]), result["seconds"], rate,
+            None if result["peak_rss_mb"] is None else round(result["peak_rss_mb"], 1)))
+
+    with open(args.output, "w") as file:
+        json.dump({"commit": git_commit(),
+                   "python": platform.python_version(),
+                   "numpy": np.__version__,
+                   "platform": platform.platform(),
+                   "results": results}, file, indent=2, default=lambda value: value.item())
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,11 @@
 from GA_core.gene import Gene
 from GA_core.chromosome import Chromosome 
 from GA_core.crossover import Crossover_Factory
-from GA_core.observer import ProgressObserver
-from GA_core.ga_classes import Genetic_Algorithm
\ No newline at end of file
+from GA_core.selection import Selection_Factory
+from GA_core.observer import Generation_Stats, ProgressObserver, LogObserver
+from GA_core.parallel import Parallel_Evaluator
+from GA_core.cache import Fitness_Cache
+from GA_core.surrogate import Surrogate_Model
+from GA_core.checkpoint import save_checkpoint, load_checkpoint
+from GA_core.ga_classes import Genetic_Algorithm
+from GA_core.islands import Island_Model
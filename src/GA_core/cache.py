@@ -0,0 +1,104 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import GA_core as ga_opt
+
+class Fitness_Cache:
+    """A bounded least-recently-used cache of fitness scores keyed by genotype.
+
+    Attributes:
+        max_size (int): the maximum number of fitness scores kept
+        hits (int): the number of lookups that found a fitness score
+        misses (int): the number of lookups that did not
+    """
+
+    def __init__(self, 
+                 max_size: int = 10000) -> None:
+        """A constructor for the Fitness_Cache class.
+
+        Args:
+            max_size (int, optional): the maximum number of fitness scores kept. Defaults to 10000.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+
+    @staticmethod
+    def key(chromosome: ga_opt.Chromosome,
+            scenario_id: str) -> bytes:
+        """Finds the cache key of a chromosome: a hash of its genotype (the type and parameters of each gene) and 
+        of the demand scenarios it is evaluated against.
+
+        Args:
+            chromosome (Chromosome): the solution
+            scenario_id (str): identifier of the demand scenarios
+
+        Returns:
+            bytes: the cache key
+        """
+        return hashlib.blake2b(scenario_id.encode() + chromosome.genotype(), digest_size=16).digest()
+
+    def get(self, 
+            key: bytes) -> float:
+        """Looks up a fitness score.
+
+        Args:
+            key (bytes): the cache key
+
+        Returns:
+            float: the fitness score, None if it is not cached
+        """
+        score = self._scores.get(key)
+        
+        if score is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._scores.move_to_end(key)
+
+        return score
+
+    def put(self, 
+            key: bytes, 
+            score: float) -> None:
+        """Stores a fitness score, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (bytes): the cache key
+            score (float): the fitness score
+        """
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+
+        if len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get_state(self) -> dict:
+        """Returns the cached scores and the counters, e.g., to save them in a checkpoint.
+
+        Returns:
+            dict: "keys" (a row of 16 bytes per key), "scores", "hits" and "misses", least recently used first
+        """
+        keys = np.frombuffer(b''.join(self._scores), dtype=np.uint8).reshape(-1, 16)
+
+        return {'keys': keys, 
+                'scores': np.array(list(self._scores.values()), dtype=float), 
+                'hits': self.hits, 
+                'misses': self.misses}
+
+    def set_state(self,
+                  state: dict) -> None:
+        """Restores the state returned by get_state.
+
+        Args:
+            state (dict): "keys", "scores", "hits" and "misses"
+        """
+        self._scores = OrderedDict((bytes(key), float(score)) for key, score in zip(state['keys'], state['scores']))
+        while len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+        self.hits = int(state['hits'])
+        self.misses = int(state['misses'])
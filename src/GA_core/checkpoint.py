@@ -0,0 +1,55 @@
+import os
+import json
+import numpy as np
+
+
+def save_checkpoint(path: str,
+                    generation: int,
+                    codes: np.ndarray,
+                    params: np.ndarray,
+                    fitness: np.ndarray,
+                    rng: np.random.Generator,
+                    **arrays) -> None:
+    """Writes the state of a genetic algorithm to an uncompressed .npz file.
+
+    The file is written next to its destination and then renamed over it, so a run preempted while 
+    checkpointing still leaves the previous checkpoint intact.
+
+    Args:
+        path (str): the checkpoint file
+        generation (int): the last completed generation
+        codes (np.ndarray): gene codes of the population
+        params (np.ndarray): gene parameters of the population
+        fitness (np.ndarray): the fitness score per solution
+        rng (np.random.Generator): the random number generator of the run
+        **arrays: any other state of the run, e.g., the training data of a surrogate model
+    """
+    temporary = path + '.tmp'
+    
+    with open(temporary, 'wb') as file:
+        np.savez(file,
+                 generation=generation,
+                 codes=codes,
+                 params=params,
+                 fitness=np.asarray(fitness, dtype=float),
+                 rng_state=json.dumps(rng.bit_generator.state),
+                 **arrays)
+
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    """Reads the state of a genetic algorithm written by save_checkpoint.
+
+    Args:
+        path (str): the checkpoint file
+
+    Returns:
+        dict: "generation", "codes", "params", "fitness", "rng_state" (a bit generator state) and any other arrays saved
+    """
+    with np.load(path) as checkpoint:
+        state = {name: checkpoint[name] for name in checkpoint.files}
+        state['generation'] = int(checkpoint['generation'])
+        state['rng_state'] = json.loads(str(checkpoint['rng_state']))
+
+    return state
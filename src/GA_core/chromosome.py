@@ -3,6 +3,8 @@ import GA_core as ga_opt
 
 
 class Chromosome(ABC):
+
+    __slots__ = ()
         
     @abstractmethod 
     def solution_initialize(self) -> list[ga_opt.Gene]:
@@ -22,6 +24,16 @@ class Chromosome(ABC):
         """
         pass
 
+    @abstractmethod
+    def genotype(self) -> bytes:
+
+        """Encodes the genes of the solution, equal solutions have equal genotypes
+
+        Returns:
+            bytes: the genotype of the solution
+        """
+        pass
+
     @abstractmethod
     def mutate_chrom(self,
                     loc: int) -> None:
@@ -1,39 +1,104 @@
 from abc import ABC, abstractmethod
-import GA_core as ga_opt
+import numpy as np
 
 class Crossover(ABC):
     """A class representing the crossover interface.
 
+    A crossover operator works on a whole mating pool at once: parents are rows of population-wide arrays and
+    every pair is crossed over with a few NumPy operations. Each operator only defines which genes the children swap.
+
     Args:
         ABC (class): Abstract class
     """
 
     @abstractmethod
-    def crossover(self, 
-                  parents: list) -> list[ga_opt.Chromosome]:
-        """Placeholder for the corssover functions.
+    def swap_mask(self,
+                  nr_pairs: int,
+                  nr_genes: int,
+                  rng: np.random.Generator) -> np.ndarray:
+        """Placeholder for the genes swapped between the parents of each pair.
 
         Args:
-            parents (list): list of Individual_Solution objects representing parent solutions
+            nr_pairs (int): the number of parent pairs
+            nr_genes (int): the number of genes of a chromosome
+            rng (np.random.Generator): random number generator
 
         Returns:
-            list: list of Individual_Solution objects representing child solutions.
+            np.ndarray: boolean mask with dimensions (nr_pairs, nr_genes), True where the children swap genes
         """
         pass
 
+    def crossover(self, 
+                  codes: np.ndarray,
+                  params: np.ndarray,
+                  pairs: np.ndarray,
+                  rate: float = 0.9,
+                  rng: np.random.Generator = None) -> tuple:
+        """Crosses over pairs of parents to generate two children per pair.
 
-class Crossover_var1(Crossover):
+        Args:
+            codes (np.ndarray): gene codes of the population with dimensions (solutions, genes)
+            params (np.ndarray): gene parameters of the population with dimensions (solutions, genes, ...)
+            pairs (np.ndarray): row indices of the parents with dimensions (pairs, 2)
+            rate (float, optional): probability of the crossover happening for a pair, otherwise the children are copies of the parents. Defaults to 0.9.
+            rng (np.random.Generator, optional): random number generator. Defaults to a new generator.
 
-    def crossover(self, 
-                  parents:list) -> list[ga_opt.Chromosome]:
-        pass
+        Returns:
+            tuple: codes and parameters of the children, the children of a pair are consecutive rows
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        nr_pairs, nr_genes = len(pairs), codes.shape[1]
 
+        swap = self.swap_mask(nr_pairs, nr_genes, rng) & (rng.random(nr_pairs) < rate)[:, None]
+        # interleave the two children of every pair
+        swap = np.stack([swap, swap], axis=1).reshape(2 * nr_pairs, nr_genes)
+        own, other = pairs.reshape(-1), pairs[:, ::-1].reshape(-1)
 
-class Crossover_var2(Crossover):
+        child_codes = np.where(swap, codes[other], codes[own])
+        child_params = np.where(swap.reshape(swap.shape + (1,) * (params.ndim - 2)), params[other], params[own])
 
-    def crossover(self, 
-                  parents:list) -> list[ga_opt.Chromosome]:
-        pass
+        return child_codes, child_params
+
+
+class One_Point_Crossover(Crossover):
+    """One-point crossover: the children swap the parents' genes after a random cut point.
+    """
+
+    def swap_mask(self,
+                  nr_pairs: int,
+                  nr_genes: int,
+                  rng: np.random.Generator) -> np.ndarray:
+        
+        cut = rng.integers(1, max(nr_genes, 2), size=(nr_pairs, 1))
+
+        return np.arange(nr_genes) >= cut
+
+
+class Two_Point_Crossover(Crossover):
+    """Two-point crossover: the children swap the parents' genes between two random cut points.
+    """
+
+    def swap_mask(self,
+                  nr_pairs: int,
+                  nr_genes: int,
+                  rng: np.random.Generator) -> np.ndarray:
+        
+        cuts = np.sort(rng.integers(0, nr_genes + 1, size=(nr_pairs, 2)), axis=1)
+        genes = np.arange(nr_genes)
+
+        return (genes >= cuts[:, :1]) & (genes < cuts[:, 1:])
+
+
+class Uniform_Crossover(Crossover):
+    """Uniform crossover: each gene of the children comes from either parent with equal probability.
+    """
+
+    def swap_mask(self,
+                  nr_pairs: int,
+                  nr_genes: int,
+                  rng: np.random.Generator) -> np.ndarray:
+        
+        return rng.random((nr_pairs, nr_genes)) < 0.5
 
 
 class Crossover_Factory():
@@ -41,30 +106,31 @@ class Crossover_Factory():
 
     Raises:
         ValueError: raises an error if an invalid crossover type is provided.
-
-    Returns:
-        list: list of Individual_Solution objects representing child solutions.
     """
 
+    options = {'one_point': One_Point_Crossover, 
+               'two_point': Two_Point_Crossover, 
+               'uniform': Uniform_Crossover}
+    _instances = {}
+
     @staticmethod
-    def create_crossover(type:str, 
-                         parents: list) -> list[ga_opt.Chromosome]:
-        """Crosses over parent solutions given the specified type
+    def create_crossover(type:str) -> Crossover:
+        """Returns the crossover operator of the specified type. Operators are stateless, so one instance per type is shared.
 
         Args:
-            type (str): type of the crossover
-            parents (list): list of Individual_Solution objects representing parent solutions
+            type (str): type of the crossover, one of 'one_point', 'two_point' or 'uniform'
 
         Raises:
             ValueError: raises an error if an invalid crossover type is provided.
 
         Returns:
-            list: list of Chromosome objects representing child solutions.
+            Crossover: the crossover operator
         """
 
-        if type == '1':
-            return Crossover_var1()
-        elif type == '2':
-            return Crossover_var2()
+        if type not in Crossover_Factory.options:
+            raise ValueError("Crossover type not valid")
         
-        else: raise ValueError("nope...")
\ No newline at end of file
+        if type not in Crossover_Factory._instances:
+            Crossover_Factory._instances[type] = Crossover_Factory.options[type]()
+
+        return Crossover_Factory._instances[type]
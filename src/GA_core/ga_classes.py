@@ -1,3 +1,6 @@
+import time
+import queue
+import numpy as np
 import GA_core as ga_opt
 import supply_chain as sc
 
@@ -5,12 +8,64 @@ class Genetic_Algorithm:
     """A class representing a genetic algorithm.
     """
 
-    def __init__(self) -> None:
+    def __init__(self,
+                 fitness_func: 'sc.Fitness_Evaluator' = None,
+                 crossover_type: str = 'one_point',
+                 selection_type: str = 'tournament',
+                 n_workers: int = 1,
+                 cache_size: int = 0,
+                 seed: int = None,
+                 incremental: bool = False,
+                 adaptive_batch: int = 0,
+                 surrogate_fraction: float = 1.0) -> None:
         """A constructor for the Genetic_Algorithm class.
+
+        Args:
+            fitness_func (Fitness_Evaluator, optional): the evaluator used to score solutions. Defaults to None.
+            crossover_type (str, optional): the crossover type passed to Crossover_Factory. Defaults to 'one_point'.
+            selection_type (str, optional): the selection type passed to Selection_Factory. Defaults to 'tournament'.
+            n_workers (int, optional): the number of processes evaluating the population. Defaults to 1.
+            cache_size (int, optional): the number of fitness scores kept in an LRU cache, 0 disables caching. Defaults to 0.
+            seed (int, optional): seed of the random number generator. Defaults to None.
+            incremental (bool, optional): whether to cache per-SKU costs on the solutions and only re-simulate mutated SKUs. 
+                Evaluation then stays in the calling process, so it cannot be combined with n_workers or adaptive_batch. 
+                Defaults to False.
+            adaptive_batch (int, optional): the number of scenarios simulated at a time by adaptive replication, where
+                solutions stop being simulated once they clearly cannot beat, or clearly beat, the best fitness so far
+                (see Fitness_Evaluator.evaluate_adaptive). Evaluation then stays in the calling process. 0 simulates 
+                every scenario. Defaults to 0.
+            surrogate_fraction (float, optional): the fraction of new solutions simulated each generation. Below 1,
+                a Surrogate_Model trained on the solutions simulated so far ranks them and only the most promising 
+                are simulated, along with a small random holdout of the others to measure the model's accuracy. The 
+                rest are scored by the model but never better than the worst simulated one. 
+                Solutions simulated before (such as the elite) keep their simulated scores, and predicted scores are 
+                not cached. Defaults to 1.0.
+
+        Raises:
+            ValueError: raises an error if incremental evaluation is combined with parallel or adaptive evaluation
         """
+        if incremental and (n_workers > 1 or adaptive_batch > 0):
+            raise ValueError("Incremental evaluation cannot be combined with n_workers or adaptive_batch")
+
         self.observers = []
         self.population = []
         self.fitness = []
+        self.fitness_func = fitness_func
+        self.crossover_type = crossover_type
+        self.selection_type = selection_type
+        self.evaluator = fitness_func if n_workers <= 1 else ga_opt.Parallel_Evaluator(fitness_func, n_workers)
+        self.cache = ga_opt.Fitness_Cache(cache_size) if cache_size > 0 else None
+        self.rng = np.random.default_rng(seed)
+        self.incremental = incremental
+        self.adaptive_batch = adaptive_batch
+        self.replications_run = 0
+        self.replications_avoided = 0
+        self.surrogate = ga_opt.Surrogate_Model() if surrogate_fraction < 1 else None
+        self.surrogate_fraction = surrogate_fraction
+        self.evaluations_saved = 0
+        self.simulated_scores = {} # genotype -> simulated fitness of the solutions in the population
+        self.evaluations = 0
+        self.phase_times = {}
         
     def create_population(self, 
                           size:int, 
@@ -25,49 +80,177 @@ class Genetic_Algorithm:
             list: a list of Individual_Solution objects representing a population.
         """
 
+        # the solutions are views into population-wide arrays, initialised in one go
+        codes = self.rng.integers(0, len(sc.Policy_Factory.options), size=(size, len(skus)), dtype=np.int8)
+        params = sc.random_params(codes, np.array([sku.capacity for sku in skus]), self.rng)
+
         for i in range(size):
-            
-            # initialise an individual solution 
-            chromosome = sc.Individual_Solution().solution_initialize(skus)
-            self.population.append(chromosome)
+            self.population.append(sc.Individual_Solution(skus, codes[i], params[i]))
 
     
-    def evaluate_population(self) -> list:
-        """Evaluates the fitness of each solution in the population.
+    def evaluate_population(self) -> np.ndarray:
+        """Evaluates the fitness of each solution in the population in a single batch.
+        With a cache, only solutions whose genotype has not been scored before are evaluated.
+
+        Returns:
+            np.ndarray: the fitness score per solution
+        """
+        if self.cache is None:
+            self.fitness, simulated = self._screen(self.population)
+            self._keep_simulated_scores(simulated)
+            return self.fitness
+
+        fitness = np.empty(len(self.population))
+        simulated = np.ones(len(self.population), dtype=bool)
+        missing = {} # cache key -> positions in the population
+
+        for i, individual in enumerate(self.population):
+            key = self.cache.key(individual, self.fitness_func.scenario_id)
+            score = self.cache.get(key) if key not in missing else None
+
+            if score is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                fitness[i] = score
+
+        if missing:
+            scores, is_simulated = self._screen([self.population[i[0]] for i in missing.values()])
+            for (key, positions), score, was_simulated in zip(missing.items(), scores, is_simulated):
+                # scores predicted by the surrogate are not cached
+                if was_simulated:
+                    self.cache.put(key, score)
+                fitness[positions] = score
+                simulated[positions] = was_simulated
+
+        self.fitness = fitness
+        self._keep_simulated_scores(simulated)
+
+        return self.fitness
+
+    def _keep_simulated_scores(self,
+                               simulated: np.ndarray) -> None:
+        
+        # with a surrogate, the solutions simulated so far keep their scores in the next generation
+        if self.surrogate is not None:
+            self.simulated_scores = {self.population[i].genotype(): self.fitness[i] for i in np.flatnonzero(simulated)}
+
+    def _screen(self,
+                population: list) -> tuple:
+        """Scores solutions, simulating only the most promising ones once the surrogate model is trained.
+
+        Args:
+            population (list): a list of Individual_Solution objects
 
         Returns:
-            list: a list of fitness scores
+            tuple: the fitness score per solution and whether it was simulated
         """
-        pass
+        simulated = np.ones(len(population), dtype=bool)
+        if self.surrogate is None:
+            return self._score(population), simulated
+
+        # solutions simulated before, such as the elite, keep their simulated scores
+        fitness = np.array([self.simulated_scores.get(individual.genotype(), np.nan) for individual in population])
+        new = np.flatnonzero(np.isnan(fitness))
+        if not len(new):
+            return fitness, simulated
+
+        codes, params = sc.Fitness_Evaluator.encode([population[i] for i in new])
+        if not self.surrogate.ready:
+            fitness[new] = self._score([population[i] for i in new])
+            self.surrogate.add(codes, params, fitness[new])
+            return fitness, simulated
+        
+        predicted = self.surrogate.predict(codes, params)
+        nr_chosen = max(int(np.ceil(self.surrogate_fraction * len(new))), 1)
+        chosen = np.zeros(len(new), dtype=bool)
+        chosen[np.argpartition(predicted, nr_chosen - 1)[:nr_chosen]] = True
+
+        # a random holdout of the others is simulated too, so the accuracy also covers the solutions the model discards
+        others = np.flatnonzero(~chosen)
+        chosen[self.rng.choice(others, size=int(np.ceil(self.surrogate.holdout * len(others))), replace=False)] = True
+
+        fitness[new[chosen]] = self._score([population[i] for i in new[chosen]])
+        fitness[new[~chosen]] = np.maximum(predicted[~chosen], fitness[new[chosen]].max())
+        simulated[new[~chosen]] = False
+        self.evaluations_saved += int((~chosen).sum())
+
+        self.surrogate.check(predicted[chosen], fitness[new[chosen]])
+        self.surrogate.add(codes[chosen], params[chosen], fitness[new[chosen]])
+
+        return fitness, simulated
+
+    def _score(self, 
+               population: list) -> np.ndarray:
+        
+        self.evaluations += len(population)
+
+        if self.incremental:
+            return self.fitness_func.evaluate_incremental(population)
+        
+        if self.adaptive_batch > 0:
+            incumbent = np.min(self.fitness) if len(self.fitness) else None
+            fitness, replications = self.fitness_func.evaluate_adaptive(*self.fitness_func.encode(population), 
+                                                                        incumbent, self.adaptive_batch)
+            self.replications_run += int(replications.sum())
+            self.replications_avoided += len(population) * len(self.fitness_func.demand) - int(replications.sum())
+            return fitness
+
+        return self.evaluator.evaluate_population(population)
 
     def select_parents(self, 
-                       pool_size:int  = 3) -> list:
-        """Selects parent solutions according to tournament selection.
+                       pool_size:int  = 3) -> np.ndarray:
+        """Selects parent solutions according to the selection type (tournament selection by default). 
+        A parent is drawn for every solution in the population in one batch.
 
         Args:
             pool_size (int, optional): the number of solution sampled from the population, i.e., the tournament size
 
         Returns:
-            list: a list of selected parent solutions.
+            np.ndarray: the indices of the selected parent solutions in the population.
         """
-        pass
+        operator = ga_opt.Selection_Factory.create_selection(self.selection_type)
+        
+        return operator.select(np.asarray(self.fitness), len(self.population), self.rng, pool_size)
 
     def crossover(self,
-                  parents: list,
+                  parents: np.ndarray,
                   rate: float = 0.9
                   ) -> list:
-        """Crossover parent solution to generate two child solutions.
+        """Crossover parent solutions to generate two child solutions per pair. Consecutive parents form a pair
+        and all pairs are crossed over in one batch.
 
         Args:
-            parents (list): parent solutions
+            parents (np.ndarray): indices of the parent solutions in the population
             rate (float, optional): probability of the crossover happening. Defaults to 0.9.
 
         Returns:
             list: a list of Individual_Solution objects representing child solutions.
         """
-        pass
+        codes, params = sc.Fitness_Evaluator.encode(self.population)
+        pairs = parents[:len(parents) // 2 * 2].reshape(-1, 2)
+
+        operator = ga_opt.Crossover_Factory.create_crossover(self.crossover_type)
+        child_codes, child_params = operator.crossover(codes, params, pairs, rate, self.rng)
+
+        # an odd parent out is carried over
+        if len(parents) % 2:
+            child_codes = np.concatenate([child_codes, codes[parents[-1:]]])
+            child_params = np.concatenate([child_params, params[parents[-1:]]])
+
+        skus = self.population[0].skus
+        children = [sc.Individual_Solution(skus, child_codes[i], child_params[i]) for i in range(len(child_codes))]
+
+        # children identical to their parent keep the parent's cost components
+        if self.incremental:
+            unchanged = (child_codes == codes[parents]).all(axis=1) & (child_params == params[parents]).all(axis=(1, 2))
+            for i in np.flatnonzero(unchanged):
+                children[i].costs = self.population[parents[i]].costs
+                children[i].mutations = dict(self.population[parents[i]].mutations)
+
+        return children
 
     def mutate(self,
+               individual: 'sc.Individual_Solution',
                rate: float = 0.9) -> None:
         """Mutates a random policy in the solution provided.
 
@@ -75,61 +258,264 @@ class Genetic_Algorithm:
             individual (Individual_Solution): the solution to be mutated.
             rate (float, optional): probability of the mutations happening. Defaults to 0.9.
         """
-        pass
+        if self.rng.random() < rate:
+            individual.mutate_chrom(self.rng.integers(len(individual.codes)), self.rng)
 
     def evolve(self,
                next_gen: list) -> None:
-        """Updates the population attribute.
+        """Updates the population attribute. The best solution of the current population replaces
+        the first child so that the best fitness never gets worse (elitism).
 
         Args:
             next_gen (list): a list of Individual_Solution objects.
         """
-        pass
+        if len(self.fitness):
+            next_gen[0] = self.population[int(np.argmin(self.fitness))]
 
-    def run_genetic(self,
-                    population: list,
-                    crossover_rate:float = 0.9,
-                    mutation_rate: float = 0.9, 
-                    generations:int = 100) -> None:
-        """Runs the genetic algorithm. 
+        self.population = next_gen
+
+    def step(self,
+             crossover_rate: float = 0.9,
+             mutation_rate: float = 0.9) -> None:
+        """Runs one generation: selection, crossover, mutation, replacement and evaluation.
+        The wall time of each phase is kept in the phase_times attribute.
 
         Args:
-            population (list): a list of Individual_Solution objects representing a population. 
             crossover_rate (float, optional): probability of the crossover happening. Defaults to 0.9.
             mutation_rate (float, optional): probability of the mutations happening. Defaults to 0.9.
-            generations (int, optional): the number of generations for the algorithm to run for. Defaults to 100.
         """
+        start = time.perf_counter()
+        parents = self.select_parents()
+        selected = time.perf_counter()
+        children = self.crossover(parents, rate=crossover_rate)
+        crossed = time.perf_counter()
+        for child in children:
+            self.mutate(child, rate=mutation_rate)
+        mutated = time.perf_counter()
+
+        self.evolve(children)
+        replaced = time.perf_counter()
+        self.evaluate_population()
+        evaluated = time.perf_counter()
+
+        self.phase_times = {'selection_time': selected - start,
+                            'crossover_time': crossed - selected,
+                            'mutation_time': mutated - crossed,
+                            'replacement_time': replaced - mutated,
+                            'evaluation_time': evaluated - replaced}
+
+    def diversity(self) -> float:
+        """Finds the share of distinct genotypes (policy codes and parameters) in the population.
+
+        Returns:
+            float: the number of distinct genotypes divided by the population size
+        """
+        codes, params = sc.Fitness_Evaluator.encode(self.population)
+        genotypes = np.concatenate([codes, params.reshape(len(params), -1)], axis=1)
 
-        print('running..')
+        return len(np.unique(genotypes, axis=0)) / len(genotypes)
 
-    def create_observer(self, observer) -> None:
-        self.observers.append(observer)
+    def generation_stats(self,
+                         generation: int,
+                         evaluations: int = 0) -> 'ga_opt.Generation_Stats':
+        """Builds the record of the last generation run.
 
-    def notify_observers(self, generation, best_solution) -> None:
+        Args:
+            generation (int): the number of the generation
+            evaluations (int, optional): the number of solutions simulated in the generation. Defaults to 0.
 
-        for observer in self.observers:
-            observer.update(generation, best_solution)
+        Returns:
+            Generation_Stats: the phase times of the last step, the counters and the diversity of the population
+        """
+        stats = ga_opt.Generation_Stats(generation, float(np.min(self.fitness)), evaluations=evaluations,
+                                        diversity=self.diversity(), **self.phase_times)
+        if self.cache is not None:
+            stats.cache_hits, stats.cache_misses = self.cache.hits, self.cache.misses
+        if self.adaptive_batch > 0:
+            stats.replications_avoided = self.replications_avoided
+        if self.surrogate is not None:
+            stats.surrogate_accuracy = self.surrogate.accuracy
+            stats.evaluations_saved = self.evaluations_saved
+
+        return stats
+
+    def emigrate(self,
+                 outbox,
+                 migrants: int) -> None:
+        """Sends copies of the fittest solutions to another island.
+
+        Args:
+            outbox (Queue): the queue of the receiving island
+            migrants (int): the number of solutions sent
+        """
+        fittest = np.argsort(self.fitness)[:migrants]
+        codes, params = sc.Fitness_Evaluator.encode([self.population[i] for i in fittest])
+        
+        outbox.put((codes, params, np.asarray(self.fitness)[fittest]))
 
+    def immigrate(self,
+                  inbox) -> None:
+        """Replaces the worst solutions with the migrants received so far, without waiting for any.
 
+        Args:
+            inbox (Queue): the queue of this island
+        """
+        while True:
+            try:
+                codes, params, fitness = inbox.get_nowait()
+            except queue.Empty:
+                return
+            
+            worst = np.argsort(self.fitness)[::-1][:len(codes)]
+            skus = self.population[0].skus
+            for i, position in enumerate(worst):
+                self.population[position] = sc.Individual_Solution(skus, codes[i], params[i])
+                self.fitness[position] = fitness[i]
+
+    def save_checkpoint(self,
+                        path: str,
+                        generation: int) -> None:
+        """Saves the population, fitness scores, random number generator state, generation counter and the evaluation
+        counters, the contents of the cache if there is one, and with a surrogate model its training data and which 
+        solutions were simulated.
+
+        Every checkpoint is a full snapshot rather than a delta of the previous one: crossover replaces nearly every 
+        solution each generation, so a delta would hold almost the whole population anyway. The per-SKU cost 
+        components of incremental evaluation are not saved, they are rebuilt by load_checkpoint, which keeps the file
+        small and the checkpoint cheap.
 
+        Args:
+            path (str): the checkpoint file (.npz)
+            generation (int): the last completed generation
+        """
+        codes, params = sc.Fitness_Evaluator.encode(self.population)
+        arrays = {'evaluations': self.evaluations,
+                  'replications_run': self.replications_run,
+                  'replications_avoided': self.replications_avoided}
+        if self.cache is not None:
+            arrays.update({'cache_' + name: value for name, value in self.cache.get_state().items()})
+        if self.surrogate is not None:
+            arrays.update({'surrogate_' + name: value for name, value in self.surrogate.get_state().items()})
+            arrays['simulated'] = np.array([individual.genotype() in self.simulated_scores for individual in self.population])
+            arrays['evaluations_saved'] = self.evaluations_saved
+
+        ga_opt.save_checkpoint(path, generation, codes, params, self.fitness, self.rng, **arrays)
+
+    def load_checkpoint(self,
+                        path: str) -> int:
+        """Restores the state saved by save_checkpoint. With incremental evaluation, the cost components of the 
+        population are rebuilt by simulating it once, without counting it as evaluations.
 
+        Args:
+            path (str): the checkpoint file (.npz)
 
+        Raises:
+            ValueError: raises an error if the run has a surrogate model and the checkpoint was saved without one
 
+        Returns:
+            int: the last completed generation
+        """
+        state = ga_opt.load_checkpoint(path)
+        skus = self.fitness_func.skus
 
+        self.population = [sc.Individual_Solution(skus, state['codes'][i], state['params'][i]) for i in range(len(state['codes']))]
+        self.fitness = state['fitness']
+        self.rng.bit_generator.state = state['rng_state']
+        self.evaluations = int(state.get('evaluations', 0))
+        self.replications_run = int(state.get('replications_run', 0))
+        self.replications_avoided = int(state.get('replications_avoided', 0))
 
+        # a checkpoint saved without a cache leaves the cache empty, it only holds scores that can be recomputed
+        if self.cache is not None and 'cache_keys' in state:
+            self.cache.set_state({name: state['cache_' + name] for name in ('keys', 'scores', 'hits', 'misses')})
 
+        if self.surrogate is not None:
+            if 'surrogate_fitness' not in state:
+                raise ValueError("The checkpoint has no surrogate model state, it was saved without a surrogate")
 
+            self.surrogate.set_state({name: state['surrogate_' + name] for name in ('codes', 'params', 'fitness', 'accuracy')})
+            self.evaluations_saved = int(state['evaluations_saved'])
+            self.simulated_scores = {self.population[i].genotype(): self.fitness[i] for i in np.flatnonzero(state['simulated'])}
 
+        if self.incremental:
+            self.fitness_func.evaluate_incremental(self.population)
 
+        return state['generation']
 
+    def run_genetic(self,
+                    population: list = None,
+                    crossover_rate:float = 0.9,
+                    mutation_rate: float = 0.9, 
+                    generations:int = 100,
+                    islands: int = 1,
+                    migration_interval: int = 10,
+                    migrants: int = 2,
+                    checkpoint_path: str = None,
+                    checkpoint_interval: int = 5,
+                    resume_from: str = None) -> None:
+        """Runs the genetic algorithm. 
 
+        With more than one island, the population is split into sub-populations evolving in separate processes
+        that exchange their fittest solutions every migration_interval generations (see Island_Model).
 
+        Args:
+            population (list, optional): a list of Individual_Solution objects representing a population. Defaults to the population attribute.
+            crossover_rate (float, optional): probability of the crossover happening. Defaults to 0.9.
+            mutation_rate (float, optional): probability of the mutations happening. Defaults to 0.9.
+            generations (int, optional): the number of generations for the algorithm to run for. Defaults to 100.
+            islands (int, optional): the number of islands. Defaults to 1.
+            migration_interval (int, optional): the number of generations between migrations. Defaults to 10.
+            migrants (int, optional): the number of solutions an island sends at each migration. Defaults to 2.
+            checkpoint_path (str, optional): file the state of the run is saved to every checkpoint_interval generations. Defaults to None.
+            checkpoint_interval (int, optional): the number of generations between checkpoints. Defaults to 5.
+            resume_from (str, optional): a checkpoint to resume the run from, it continues with the generation after the saved one. Defaults to None.
+        """
 
+        if population is not None:
+            self.population = population
 
+        if islands > 1:
+            if checkpoint_path is not None or resume_from is not None:
+                raise ValueError("Checkpoints are not supported in island mode")
 
+            ga_opt.Island_Model(self, islands, migration_interval, migrants).run(crossover_rate, mutation_rate, generations)
+            return
 
+        try:
+            if resume_from is not None:
+                start = self.load_checkpoint(resume_from) + 1
+            else:
+                start = 0
+                self.evaluate_population()
 
+            for generation in range(start, generations):
 
+                evaluations = self.evaluations
+                self.step(crossover_rate, mutation_rate)
 
+                best = int(np.argmin(self.fitness))
+                if self.observers:
+                    self.notify_observers(self.generation_stats(generation, self.evaluations - evaluations), self.population[best])
 
+                if checkpoint_path is not None and (generation + 1) % checkpoint_interval == 0:
+                    self.save_checkpoint(checkpoint_path, generation)
         
+        finally:
+            # stop the worker processes, if any
+            if isinstance(self.evaluator, ga_opt.Parallel_Evaluator):
+                self.evaluator.shutdown()
+
+    def create_observer(self, observer) -> None:
+        self.observers.append(observer)
+
+    def notify_observers(self, 
+                         stats: 'ga_opt.Generation_Stats', 
+                         best_solution: 'sc.Individual_Solution') -> None:
+        """Sends the record of a generation and its best solution to every observer.
+
+        Args:
+            stats (Generation_Stats): the record of the generation
+            best_solution (Individual_Solution): the solution with the best fitness
+        """
+        for observer in self.observers:
+            observer.update(stats, best_solution)
@@ -3,6 +3,8 @@ from abc import ABC, abstractmethod
 
 class Gene(ABC):
 
+    __slots__ = ()
+
     @abstractmethod
     def mutate_gene(self):
         pass
\ No newline at end of file
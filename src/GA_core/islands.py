@@ -0,0 +1,211 @@
+import queue
+import traceback
+import multiprocessing as mp
+import numpy as np
+import GA_core as ga_opt
+import supply_chain as sc
+
+
+def _run_island(island: int,
+                settings: dict,
+                skus: list,
+                codes: np.ndarray,
+                params: np.ndarray,
+                inbox: mp.Queue,
+                outbox: mp.Queue,
+                progress: mp.Queue) -> None:
+    """Evolves one sub-population in a worker process.
+
+    Every migration_interval generations the island sends copies of its fittest solutions to the next island and 
+    replaces its worst solutions with whatever migrants have arrived, without waiting for any. The best solution of 
+    every generation, with the record of the generation if the GA has observers, and the final population are 
+    reported on the progress queue.
+    """
+    try:
+        ga = ga_opt.Genetic_Algorithm(fitness_func=settings['fitness_func'],
+                                      crossover_type=settings['crossover_type'],
+                                      selection_type=settings['selection_type'],
+                                      cache_size=settings['cache_size'],
+                                      seed=settings['seed'],
+                                      incremental=settings['incremental'],
+                                      adaptive_batch=settings['adaptive_batch'],
+                                      surrogate_fraction=settings['surrogate_fraction'])
+        ga.population = [sc.Individual_Solution(skus, codes[i], params[i]) for i in range(len(codes))]
+        ga.evaluate_population()
+
+        for generation in range(settings['generations']):
+            evaluations = ga.evaluations
+            ga.step(settings['crossover_rate'], settings['mutation_rate'])
+
+            if (generation + 1) % settings['migration_interval'] == 0:
+                ga.emigrate(outbox, settings['migrants'])
+                ga.immigrate(inbox)
+
+            best = int(np.argmin(ga.fitness))
+            stats = ga.generation_stats(generation, ga.evaluations - evaluations) if settings['observed'] else None
+            progress.put(('progress', island, generation, float(ga.fitness[best]), 
+                          ga.population[best].codes, ga.population[best].params, stats))
+
+        codes, params = sc.Fitness_Evaluator.encode(ga.population)
+        progress.put(('done', island, codes, params, np.asarray(ga.fitness)))
+
+    except Exception:
+        progress.put(('error', island, traceback.format_exc()))
+
+
+class Island_Model:
+    """A class running a genetic algorithm as several islands, i.e., sub-populations evolving independently in 
+    separate processes and periodically exchanging their fittest solutions along a ring of local queues.
+
+    Attributes:
+        ga (Genetic_Algorithm): the genetic algorithm whose population is split across the islands
+        islands (int): the number of islands
+        migration_interval (int): the number of generations between migrations
+        migrants (int): the number of solutions an island sends at each migration
+    """
+
+    def __init__(self,
+                 ga: 'ga_opt.Genetic_Algorithm',
+                 islands: int,
+                 migration_interval: int = 10,
+                 migrants: int = 2) -> None:
+        """A constructor for the Island_Model class.
+
+        Args:
+            ga (Genetic_Algorithm): the genetic algorithm whose population is split across the islands
+            islands (int): the number of islands
+            migration_interval (int, optional): the number of generations between migrations. Defaults to 10.
+            migrants (int, optional): the number of solutions an island sends at each migration. Defaults to 2.
+        """
+        self.ga = ga
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+
+    def run(self,
+            crossover_rate: float,
+            mutation_rate: float,
+            generations: int) -> None:
+        """Runs the islands and merges their progress into a single stream of notify_observers calls, 
+        one per generation with the best solution across the islands. The final sub-populations are
+        gathered back into the population of the genetic algorithm.
+
+        Args:
+            crossover_rate (float): probability of the crossover happening
+            mutation_rate (float): probability of the mutations happening
+            generations (int): the number of generations for the islands to run for
+        """
+        ga = self.ga
+        skus = ga.population[0].skus
+        codes, params = sc.Fitness_Evaluator.encode(ga.population)
+        seeds = ga.rng.integers(0, 2**32, size=self.islands)
+
+        # the islands map the demand tensor instead of receiving a copy
+        ga.fitness_func.share()
+
+        inboxes = [mp.Queue() for _ in range(self.islands)]
+        progress = mp.Queue()
+        processes = []
+
+        for island, members in enumerate(np.array_split(np.arange(len(codes)), self.islands)):
+            settings = {'fitness_func': ga.fitness_func,
+                        'crossover_type': ga.crossover_type,
+                        'selection_type': ga.selection_type,
+                        'cache_size': 0 if ga.cache is None else ga.cache.max_size,
+                        'seed': seeds[island],
+                        'incremental': ga.incremental,
+                        'adaptive_batch': ga.adaptive_batch,
+                        'surrogate_fraction': ga.surrogate_fraction,
+                        'generations': generations,
+                        'crossover_rate': crossover_rate,
+                        'mutation_rate': mutation_rate,
+                        'migration_interval': self.migration_interval,
+                        'migrants': self.migrants,
+                        'observed': bool(ga.observers)}
+            process = mp.Process(target=_run_island, 
+                                 args=(island, settings, skus, codes[members], params[members], 
+                                       inboxes[island], inboxes[(island + 1) % self.islands], progress),
+                                 daemon=True)
+            process.start()
+            processes.append(process)
+
+        try:
+            self._merge(progress, processes, generations, skus)
+        
+        finally:
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+            ga.fitness_func.release()
+
+    def _merge(self,
+               progress: mp.Queue,
+               processes: list,
+               generations: int,
+               skus: list,
+               poll_interval: float = 1.0) -> None:
+        
+        ga = self.ga
+        pending = {} # generation -> reports received so far
+        final = {}
+
+        while len(final) < self.islands:
+            try:
+                message = progress.get(timeout=poll_interval)
+            except queue.Empty:
+                # an island killed without reporting (e.g., out of memory) never sends 'done'. A process that has 
+                # exited has flushed its messages, so an empty queue means they have all been read
+                exited = [island for island, process in enumerate(processes) 
+                          if island not in final and process.exitcode is not None]
+                if exited and progress.empty():
+                    raise RuntimeError(f"Island {exited[0]} exited with code {processes[exited[0]].exitcode} before finishing")
+                continue
+
+            if message[0] == 'error':
+                raise RuntimeError(f"Island {message[1]} failed:\n{message[2]}")
+
+            if message[0] == 'done':
+                final[message[1]] = message[2:]
+                continue
+
+            _, island, generation, score, best_codes, best_params, stats = message
+            reports = pending.setdefault(generation, [])
+            reports.append((score, best_codes, best_params, stats))
+
+            # a generation is reported once every island has completed it
+            if len(reports) == self.islands:
+                score, best_codes, best_params, _ = min(reports, key=lambda report: report[0])
+                if ga.observers:
+                    ga.notify_observers(self._merge_stats([report[3] for report in reports]), 
+                                        sc.Individual_Solution(skus, best_codes, best_params))
+                del pending[generation]
+
+        codes, params, fitness = (np.concatenate([final[island][i] for island in range(self.islands)]) for i in range(3))
+        ga.population = [sc.Individual_Solution(skus, codes[i], params[i]) for i in range(len(codes))]
+        ga.fitness = fitness
+
+    @staticmethod
+    def _merge_stats(records: list) -> 'ga_opt.Generation_Stats':
+        """Combines the records of a generation across the islands. The islands run in parallel, so each phase 
+        takes as long as on the slowest island, while the counters are summed and the diversity and surrogate 
+        accuracy are averaged.
+        """
+        stats = ga_opt.Generation_Stats(records[0].generation, min(record.best_score for record in records))
+
+        for name in ('selection_time', 'crossover_time', 'mutation_time', 'evaluation_time', 'replacement_time'):
+            setattr(stats, name, max(getattr(record, name) for record in records))
+        stats.evaluations = sum(record.evaluations for record in records)
+        stats.diversity = float(np.mean([record.diversity for record in records]))
+        if records[0].cache_hits is not None:
+            stats.cache_hits = sum(record.cache_hits for record in records)
+            stats.cache_misses = sum(record.cache_misses for record in records)
+        if records[0].replications_avoided is not None:
+            stats.replications_avoided = sum(record.replications_avoided for record in records)
+        if records[0].evaluations_saved is not None:
+            stats.evaluations_saved = sum(record.evaluations_saved for record in records)
+            # each island trains a surrogate of its own
+            accuracy = [record.surrogate_accuracy for record in records if record.surrogate_accuracy is not None]
+            stats.surrogate_accuracy = float(np.mean(accuracy)) if accuracy else None
+
+        return stats
@@ -1,17 +1,120 @@
+import os
+import csv
+import json
+import dataclasses
 import GA_core as ga_opt
 
+@dataclasses.dataclass
+class Generation_Stats:
+    """A record of one generation of the GA, sent to the observers.
+
+    Attributes:
+        generation (int): the number of the generation
+        best_score (float): the best fitness in the population
+        selection_time (float): wall time spent selecting parents, in seconds
+        crossover_time (float): wall time spent on crossover, in seconds
+        mutation_time (float): wall time spent on mutation, in seconds
+        evaluation_time (float): wall time spent evaluating the population, in seconds
+        replacement_time (float): wall time spent replacing the population, in seconds
+        evaluations (int): the number of solutions simulated in the generation
+        diversity (float): the share of distinct genotypes in the population
+        cache_hits (int): the number of fitness scores found in the cache so far, None if there is no cache
+        cache_misses (int): the number of fitness scores missing from the cache so far, None if there is no cache
+        replications_avoided (int): the number of scenario simulations skipped by adaptive replication so far,
+            None if it is not used
+        surrogate_accuracy (float): rank correlation between the surrogate's predictions and the simulated fitness of
+            the last batch, the solutions it picked and a random holdout of the others, None if there is no surrogate 
+            or it is not trained yet
+        evaluations_saved (int): the number of solutions scored by the surrogate instead of simulated so far,
+            None if there is no surrogate
+    """
+    generation: int
+    best_score: float
+    selection_time: float = 0.0
+    crossover_time: float = 0.0
+    mutation_time: float = 0.0
+    evaluation_time: float = 0.0
+    replacement_time: float = 0.0
+    evaluations: int = 0
+    diversity: float = None
+    cache_hits: int = None
+    cache_misses: int = None
+    replications_avoided: int = None
+    surrogate_accuracy: float = None
+    evaluations_saved: int = None
+
+    @property
+    def total_time(self) -> float:
+        """The wall time of the generation, in seconds.
+        """
+        return self.selection_time + self.crossover_time + self.mutation_time + self.evaluation_time + self.replacement_time
+
+
 class ProgressObserver:
     """A class representing a progress observer.
     """
-    def update(self, 
-               generation: int, 
-               best_score: float,
-               best_solution: ga_opt.Chromosome):
+    def update(self,
+               stats: Generation_Stats,
+               best_solution: ga_opt.Chromosome) -> None:
         """Updates observer about the progress of the GA
 
         Args:
-            generation (int): the number of the generation
-            best_score (float): the fitness of the solution
+            stats (Generation_Stats): the record of the generation
             best_solution (Individual_Solution): Individual_Solution object with the best fitness
         """
-        print(f"Generation {generation}: Best solution - {best_score}")
\ No newline at end of file
+        message = f"Generation {stats.generation}: Best solution - {stats.best_score} ({stats.total_time:.3f}s)"
+        if stats.cache_hits is not None:
+            message += f" (cache hits {stats.cache_hits}, misses {stats.cache_misses})"
+        if stats.replications_avoided is not None:
+            message += f" (replications avoided {stats.replications_avoided})"
+        if stats.evaluations_saved is not None:
+            message += f" (evaluations saved {stats.evaluations_saved}, surrogate accuracy {stats.surrogate_accuracy})"
+
+        print(message)
+
+
+class LogObserver:
+    """A class logging a Generation_Stats record per generation to a file, as JSON lines or CSV (chosen by the file
+    extension). The file is line buffered, so the records of a run that is interrupted are kept.
+    """
+    def __init__(self,
+                 path: str) -> None:
+        """A constructor for the LogObserver class, starts from an empty file.
+
+        Args:
+            path (str): the log file, ending in .jsonl or .csv
+        """
+        self.path = path
+        self.csv = os.path.splitext(path)[1] == '.csv'
+        self._file = open(path, 'w', buffering=1, newline='')
+        self._writer = None
+
+        if self.csv:
+            fields = [field.name for field in dataclasses.fields(Generation_Stats)]
+            self._writer = csv.DictWriter(self._file, fieldnames=fields)
+            self._writer.writeheader()
+
+    def update(self,
+               stats: Generation_Stats,
+               best_solution: ga_opt.Chromosome) -> None:
+        """Writes the record of a generation.
+
+        Args:
+            stats (Generation_Stats): the record of the generation
+            best_solution (Individual_Solution): Individual_Solution object with the best fitness, not logged
+        """
+        record = dataclasses.asdict(stats)
+
+        if self.csv:
+            self._writer.writerow(record)
+        else:
+            self._file.write(json.dumps(record) + '\n')
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
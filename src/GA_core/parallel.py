@@ -0,0 +1,133 @@
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# the evaluator of a worker process, set once by the pool initializer
+_worker_fitness_func = None
+
+
+def _init_worker(fitness_func) -> None:
+    global _worker_fitness_func
+    _worker_fitness_func = fitness_func
+
+
+def _evaluate_chunk(codes: np.ndarray, 
+                    params: np.ndarray) -> tuple:
+    start = time.perf_counter()
+    fitness = _worker_fitness_func.evaluate(codes, params)
+
+    return fitness, time.perf_counter() - start
+
+
+class Parallel_Evaluator:
+    """A class spreading fitness evaluation over a pool of worker processes.
+
+    The evaluator's demand tensor is moved into shared memory, so each worker maps it once instead of receiving 
+    a copy with every task. Only the encoded solutions travel to the workers. The number of chunks a population
+    is split into adapts to the measured evaluation time per solution and overhead per task: populations too 
+    small to benefit from the pool are evaluated in the calling process.
+
+    Attributes:
+        fitness_func (Fitness_Evaluator): the evaluator used to score solutions
+        n_workers (int): the number of worker processes
+    """
+
+    def __init__(self,
+                 fitness_func,
+                 n_workers: int) -> None:
+        """A constructor for the Parallel_Evaluator class.
+
+        Args:
+            fitness_func (Fitness_Evaluator): the evaluator used to score solutions
+            n_workers (int): the number of worker processes
+        """
+        self.fitness_func = fitness_func
+        self.n_workers = n_workers
+        self.cost_per_solution = None # seconds to evaluate a solution
+        self.task_overhead = 1e-3 # seconds of IPC and scheduling per task
+        self._executor = None
+
+    def encode(self, 
+               population: list) -> tuple:
+        return self.fitness_func.encode(population)
+
+    def _nr_chunks(self, 
+                   size: int) -> int:
+        """Finds the number of chunks a population should be split into.
+        
+        Splitting into k chunks takes about size * cost / k + k * overhead seconds, so a chunk is only 
+        added while it saves more evaluation time than it costs in overhead.
+        """
+        if self.cost_per_solution is None:
+            return 1
+
+        best = np.sqrt(size * self.cost_per_solution / self.task_overhead)
+
+        return int(np.clip(best, 1, min(self.n_workers, size)))
+
+    def evaluate(self, 
+                 codes: np.ndarray, 
+                 params: np.ndarray) -> np.ndarray:
+        """Finds the fitness of encoded solutions, in parallel if it pays off.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (solutions, skus)
+            params (np.ndarray): policy parameters with dimensions (solutions, skus, 2)
+
+        Returns:
+            np.ndarray: the fitness per solution
+        """
+        nr_chunks = self._nr_chunks(len(codes))
+
+        if nr_chunks == 1:
+            start = time.perf_counter()
+            fitness = self.fitness_func.evaluate(codes, params)
+            self._update_cost(time.perf_counter() - start, len(codes))
+            
+            return fitness
+
+        if self._executor is None:
+            self.fitness_func.share()
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers,
+                                                 initializer=_init_worker,
+                                                 initargs=(self.fitness_func,))
+
+        start = time.perf_counter()
+        futures = [self._executor.submit(_evaluate_chunk, chunk_codes, chunk_params)
+                   for chunk_codes, chunk_params in zip(np.array_split(codes, nr_chunks), 
+                                                        np.array_split(params, nr_chunks))]
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+
+        # the time not spent evaluating in the slowest worker is attributed to overhead
+        compute = [duration for _, duration in results]
+        self._update_cost(sum(compute), len(codes))
+        self.task_overhead = 0.8 * self.task_overhead + 0.2 * max(elapsed - max(compute), 1e-6) / nr_chunks
+
+        return np.concatenate([fitness for fitness, _ in results])
+
+    def _update_cost(self, 
+                     duration: float, 
+                     size: int) -> None:
+        cost = duration / max(size, 1)
+        self.cost_per_solution = cost if self.cost_per_solution is None else 0.8 * self.cost_per_solution + 0.2 * cost
+
+    def evaluate_population(self, 
+                            population: list) -> np.ndarray:
+        """Finds the fitness of a population of solutions.
+
+        Args:
+            population (list): a list of Individual_Solution objects
+
+        Returns:
+            np.ndarray: the fitness per solution
+        """
+        return self.evaluate(*self.encode(population))
+
+    def shutdown(self) -> None:
+        """Stops the worker processes and frees the shared demand tensor.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self.fitness_func.release()
@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+class Selection(ABC):
+    """A class representing the parent selection interface.
+
+    A selection operator draws every parent of a generation in one call. Lower fitness is better.
+
+    Args:
+        ABC (class): Abstract class
+    """
+
+    @abstractmethod
+    def select(self,
+               fitness: np.ndarray,
+               nr_parents: int,
+               rng: np.random.Generator,
+               pool_size: int = 3) -> np.ndarray:
+        """Placeholder for the selection functions.
+
+        Args:
+            fitness (np.ndarray): the fitness score per solution
+            nr_parents (int): the number of parents to select
+            rng (np.random.Generator): random number generator
+            pool_size (int, optional): the tournament size. Defaults to 3.
+
+        Returns:
+            np.ndarray: the indices of the selected parents
+        """
+        pass
+
+
+class Tournament_Selection(Selection):
+    """Tournament selection: each parent is the fittest of pool_size solutions sampled with replacement.
+    All tournaments are drawn as one (nr_parents, pool_size) index matrix, no sorting is needed.
+    """
+
+    def select(self,
+               fitness: np.ndarray,
+               nr_parents: int,
+               rng: np.random.Generator,
+               pool_size: int = 3) -> np.ndarray:
+        
+        pools = rng.integers(0, len(fitness), size=(nr_parents, pool_size))
+        winners = np.argmin(fitness[pools], axis=1)
+
+        return pools[np.arange(nr_parents), winners]
+
+
+class Truncation_Selection(Selection):
+    """Truncation selection: parents are drawn uniformly from the fittest fraction of the population.
+    The fittest solutions are found with a partial sort (np.argpartition).
+    """
+
+    def __init__(self, 
+                 fraction: float = 0.5) -> None:
+        """A constructor for the Truncation_Selection class.
+
+        Args:
+            fraction (float, optional): the fraction of the population eligible as parents. Defaults to 0.5.
+        """
+        self.fraction = fraction
+
+    def select(self,
+               fitness: np.ndarray,
+               nr_parents: int,
+               rng: np.random.Generator,
+               pool_size: int = 3) -> np.ndarray:
+        
+        nr_fittest = max(1, int(len(fitness) * self.fraction))
+        fittest = np.argpartition(fitness, nr_fittest - 1)[:nr_fittest]
+
+        return fittest[rng.integers(0, nr_fittest, size=nr_parents)]
+
+
+class Rank_Selection(Selection):
+    """Linear rank-based selection: the probability of a solution being drawn is proportional to 
+    the number of solutions it beats plus one. The population is sorted once per call.
+    """
+
+    def select(self,
+               fitness: np.ndarray,
+               nr_parents: int,
+               rng: np.random.Generator,
+               pool_size: int = 3) -> np.ndarray:
+        
+        order = np.argsort(fitness, kind='stable')
+        weights = np.arange(len(fitness), 0, -1, dtype=float)
+        
+        # the sampled ranks are mapped back to solutions
+        ranks = np.searchsorted(np.cumsum(weights), rng.random(nr_parents) * weights.sum(), side='right')
+
+        return order[ranks]
+
+
+class Selection_Factory():
+    """A class implementing the factory design pattern.
+
+    Raises:
+        ValueError: raises an error if an invalid selection type is provided.
+    """
+
+    options = {'tournament': Tournament_Selection, 
+               'truncation': Truncation_Selection, 
+               'rank': Rank_Selection}
+    _instances = {}
+
+    @staticmethod
+    def create_selection(type:str) -> Selection:
+        """Returns the selection operator of the specified type, one instance per type is shared.
+
+        Args:
+            type (str): type of the selection, one of 'tournament', 'truncation' or 'rank'
+
+        Raises:
+            ValueError: raises an error if an invalid selection type is provided.
+
+        Returns:
+            Selection: the selection operator
+        """
+
+        if type not in Selection_Factory.options:
+            raise ValueError("Selection type not valid")
+        
+        if type not in Selection_Factory._instances:
+            Selection_Factory._instances[type] = Selection_Factory.options[type]()
+
+        return Selection_Factory._instances[type]
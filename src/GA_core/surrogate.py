@@ -0,0 +1,158 @@
+import numpy as np
+import supply_chain as sc
+
+class Surrogate_Model:
+    """A ridge regression of fitness on the encoded genes, trained online on the solutions simulated so far.
+
+    Each SKU contributes a one-hot policy code and, in the slot of that policy, its two parameters and their squares,
+    so the fitted cost is a sum of per-SKU, per-policy quadratics. The columns are standardised over the training
+    solutions, and the normal equations are solved in the primal or the dual form, whichever is smaller.
+
+    Attributes:
+        alpha (float): the ridge penalty
+        max_samples (int): the number of most recent solutions trained on
+        min_samples (int): the number of solutions needed before predicting
+        holdout (float): the share of the solutions the model does not pick that are simulated anyway, drawn at random, 
+            so that its accuracy is measured on the solutions it discards as well as on the ones it picks
+        accuracy (float): rank correlation between the predicted and simulated fitness of the last batch checked,
+            None before the first check
+    """
+
+    def __init__(self,
+                 alpha: float = 1.0,
+                 max_samples: int = 2000,
+                 min_samples: int = 20,
+                 holdout: float = 0.1) -> None:
+        """A constructor for the Surrogate_Model class.
+
+        Args:
+            alpha (float, optional): the ridge penalty. Defaults to 1.0.
+            max_samples (int, optional): the number of most recent solutions trained on. Defaults to 2000.
+            min_samples (int, optional): the number of solutions needed before predicting. Defaults to 20.
+            holdout (float, optional): the share of the solutions not picked that are simulated at random. Defaults to 0.1.
+        """
+        self.alpha = alpha
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.holdout = holdout
+        self.accuracy = None
+        self._codes = None
+        self._params = None
+        self._fitness = np.zeros(0)
+        self._model = None
+
+    @staticmethod
+    def features(codes: np.ndarray,
+                 params: np.ndarray) -> np.ndarray:
+        """Encodes solutions as regression features.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (solutions, skus)
+            params (np.ndarray): policy parameters with dimensions (solutions, skus, 2)
+
+        Returns:
+            np.ndarray: features with dimensions (solutions, skus * options * 5)
+        """
+        one_hot = (codes[..., None] == np.arange(len(sc.Policy_Factory.options))).astype(float)
+        params = params.astype(float)
+        terms = np.concatenate([np.ones_like(params[..., :1]), params, params**2], axis=-1)
+
+        return (one_hot[..., None] * terms[..., None, :]).reshape(len(codes), -1)
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough solutions have been seen to predict.
+        """
+        return len(self._fitness) >= self.min_samples
+
+    def add(self,
+            codes: np.ndarray,
+            params: np.ndarray,
+            fitness: np.ndarray) -> None:
+        """Adds simulated solutions to the training set and refits the model.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (solutions, skus)
+            params (np.ndarray): policy parameters with dimensions (solutions, skus, 2)
+            fitness (np.ndarray): the simulated fitness per solution
+        """
+        if self._codes is not None:
+            codes = np.concatenate([self._codes, codes])
+            params = np.concatenate([self._params, params])
+        self._codes = codes[-self.max_samples:]
+        self._params = params[-self.max_samples:]
+        self._fitness = np.concatenate([self._fitness, np.asarray(fitness, dtype=float)])[-self.max_samples:]
+
+        if self.ready:
+            self._fit()
+
+    def get_state(self) -> dict:
+        """Returns the training solutions and the accuracy, e.g., to save them in a checkpoint.
+
+        Returns:
+            dict: "codes", "params", "fitness" and "accuracy" (NaN before the first check)
+        """
+        return {'codes': self._codes, 
+                'params': self._params, 
+                'fitness': self._fitness, 
+                'accuracy': np.nan if self.accuracy is None else self.accuracy}
+
+    def set_state(self,
+                  state: dict) -> None:
+        """Restores the state returned by get_state and refits the model.
+
+        Args:
+            state (dict): "codes", "params", "fitness" and "accuracy"
+        """
+        self._codes, self._params, self._fitness, self._model = None, None, np.zeros(0), None
+        self.add(state['codes'], state['params'], state['fitness'])
+        self.accuracy = None if np.isnan(state['accuracy']) else float(state['accuracy'])
+
+    def _fit(self) -> None:
+
+        x = self.features(self._codes, self._params)
+        mean, scale = x.mean(axis=0), x.std(axis=0)
+        scale[scale == 0] = 1
+        x = (x - mean) / scale
+        y = self._fitness - self._fitness.mean()
+
+        if len(x) < x.shape[1]:
+            weights = x.T @ np.linalg.solve(x @ x.T + self.alpha * np.eye(len(x)), y)
+        else:
+            weights = np.linalg.solve(x.T @ x + self.alpha * np.eye(x.shape[1]), x.T @ y)
+
+        self._model = (mean, scale, weights, self._fitness.mean())
+
+    def predict(self,
+                codes: np.ndarray,
+                params: np.ndarray) -> np.ndarray:
+        """Predicts the fitness of solutions.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (solutions, skus)
+            params (np.ndarray): policy parameters with dimensions (solutions, skus, 2)
+
+        Returns:
+            np.ndarray: the predicted fitness per solution
+        """
+        mean, scale, weights, intercept = self._model
+
+        return (self.features(codes, params) - mean) / scale @ weights + intercept
+
+    def check(self,
+              predicted: np.ndarray,
+              fitness: np.ndarray) -> float:
+        """Updates the accuracy with the rank correlation between predictions and simulated fitness.
+
+        Args:
+            predicted (np.ndarray): the predicted fitness per solution
+            fitness (np.ndarray): the simulated fitness per solution
+
+        Returns:
+            float: the accuracy, None with fewer than two solutions
+        """
+        if len(fitness) > 1:
+            ranks = np.argsort(np.argsort(predicted)), np.argsort(np.argsort(fitness))
+            self.accuracy = float(np.corrcoef(*ranks)[0, 1])
+
+        return self.accuracy
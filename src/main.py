@@ -1,3 +1,4 @@
+import numpy as np
 import GA_core as ga_opt
 import supply_chain as sc
 
@@ -7,16 +8,22 @@ if __name__=='__main__':
     # generate some random SKUs
     for i in range(5):
         sku = sc.SKU(name= "sku_" + str(i), 
-                     quantity= i)
+                     quantity= 50,
+                     lead_time= i + 1,
+                     capacity= 200)
         skus.append(sku)
 
+    # generate demand scenarios per SKU and day
+    demand = np.random.default_rng(0).poisson(lam=10, size=(20, len(skus), 90))
+
     # initialise the GA
-    optimizer = ga_opt.Genetic_Algorithm()
+    optimizer = ga_opt.Genetic_Algorithm(fitness_func=sc.Fitness_Evaluator(skus=skus, demand=demand))
+    optimizer.create_observer(ga_opt.ProgressObserver())
     # initialise the population
     optimizer.create_population(size= 100,
                                 skus= skus)
     
-    print(len(optimizer.population))
+    optimizer.run_genetic(generations= 100)
 
 """
     0) Initialise the SKU objects
@@ -37,4 +44,4 @@ if __name__=='__main__':
         FF = Order Costs + Holding Costs + Stockout Costs 
 
     
-"""
\ No newline at end of file
+"""
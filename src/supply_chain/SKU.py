@@ -5,14 +5,20 @@ class SKU:
     Attributes:
         name (str): name of the SKU
         quantity (int): quantity of the SKU
+        lead_time (int): number of days between placing an order and receiving it
+        capacity (int): maximum quantity of the SKU that can be stored, bounds the policy parameters
     """
 
     def __init__(self, 
                  name: str,
-                 quantity: int) -> None:
+                 quantity: int,
+                 lead_time: int = 1,
+                 capacity: int = 100) -> None:
         
         """ A constuctor for the SKU class
         """
         
         self.name = name
-        self.quantity = quantity
\ No newline at end of file
+        self.quantity = quantity
+        self.lead_time = lead_time
+        self.capacity = capacity
@@ -1,4 +1,5 @@
 from supply_chain.SKU import SKU
 from supply_chain.solution import Individual_Solution
-from supply_chain.policies import Policy_Factory
+from supply_chain.policies import Policy_Factory, random_params
+from supply_chain.evaluation import Fitness_Evaluator
 
@@ -0,0 +1,489 @@
+import hashlib
+import mmap
+from multiprocessing import shared_memory
+import numpy as np
+
+class Fitness_Evaluator:
+    """A class simulating inventory policies against a shared demand tensor.
+
+    The fitness of a solution follows the README: 
+        FF = Order Costs + Holding Costs + Stockout Costs
+    averaged over the demand scenarios. Lower is better.
+
+    Attributes:
+        skus (list): a list of SKU objects, in the same order as the policies of a solution
+        demand (np.ndarray): demand per scenario, SKU and day, dimensions (scenarios, skus, days)
+        starting_inventory (np.ndarray): starting inventory per SKU
+        lead_time (np.ndarray): lead time of an order per scenario, SKU and day, dimensions (scenarios, skus, days) 
+                                or (1, skus, 1) if every order of a SKU takes the SKU's lead time
+        suppliers (np.ndarray): supplier index per SKU, a delivery cost is paid once per supplier and day with orders
+        holding_cost (float): cost per item in stock per day
+        delivery_cost (float): cost per delivery
+        stock_out_cost (float): cost per SKU and day with a stock out
+        per_item_cost (np.ndarray): price per item ordered per SKU
+        scenario_id (str): identifier of the demand scenarios
+    """
+
+    def __init__(self,
+                 skus: list,
+                 demand: np.ndarray,
+                 holding_cost: float = 0.05,
+                 delivery_cost: float = 100,
+                 stock_out_cost: float = 100000,
+                 per_item_cost: float = 100,
+                 suppliers: list = None,
+                 scenario_id: str = None,
+                 lead_times: np.ndarray = None) -> None:
+        """A constructor for the Fitness_Evaluator class.
+
+        Args:
+            skus (list): a list of SKU objects, in the same order as the policies of a solution
+            demand (np.ndarray): integer demand with dimensions (skus, days) or (scenarios, skus, days), a memory map 
+                                 (e.g., from a Scenario_Bank) is used in place and sent to workers as a file reference
+            holding_cost (float, optional): cost per item in stock per day. Defaults to 0.05.
+            delivery_cost (float, optional): cost per delivery. Defaults to 100.
+            stock_out_cost (float, optional): cost per SKU and day with a stock out. Defaults to 100000.
+            per_item_cost (float, optional): price per item ordered, a scalar or one per SKU. Defaults to 100.
+            suppliers (list, optional): supplier index per SKU. Defaults to a separate supplier per SKU.
+            scenario_id (str, optional): identifier of the demand scenarios. Defaults to a hash of the demand and lead times.
+            lead_times (np.ndarray, optional): pre-sampled lead time of an order per scenario, SKU and day, e.g., from
+                                               sample_lead_times. Every solution sees the same draws (common random 
+                                               numbers), so differences in fitness come from the policies alone. 
+                                               Defaults to the lead time of each SKU.
+        """
+
+        demand = np.asanyarray(demand)
+        if demand.dtype.kind not in 'iu':
+            demand = demand.astype(np.int64)
+        # a contiguous memory map over a file is mapped again by the workers instead of being pickled
+        self._mapping = None
+        if isinstance(demand, np.memmap) and isinstance(demand.base, mmap.mmap) and demand.flags.c_contiguous:
+            self._mapping = (demand.filename, demand.offset, demand.dtype.str)
+        if demand.ndim == 2:
+            demand = demand[None]
+        if demand.shape[1] != len(skus):
+            raise ValueError("The demand does not match the number of SKUs")
+
+        if lead_times is None:
+            lead_times = np.array([sku.lead_time for sku in skus], dtype=np.int64)[None, :, None]
+        else:
+            lead_times = np.asarray(lead_times, dtype=np.int64)
+            if lead_times.ndim == 2:
+                lead_times = lead_times[None]
+            if lead_times.shape[1:] != demand.shape[1:] or lead_times.shape[0] not in (1, demand.shape[0]):
+                raise ValueError("The lead times do not match the demand")
+
+        if scenario_id is None:
+            scenario_hash = hashlib.blake2b(np.ascontiguousarray(demand).data, digest_size=8)
+            scenario_hash.update(np.ascontiguousarray(lead_times).data)
+            scenario_id = scenario_hash.hexdigest()
+
+        self.skus = skus
+        self.demand = demand
+        self.scenario_id = scenario_id
+        self.starting_inventory = np.array([sku.quantity for sku in skus], dtype=np.int64)
+        self.lead_time = lead_times
+        self.suppliers = np.arange(len(skus)) if suppliers is None else np.asarray(suppliers)
+        self.holding_cost = holding_cost
+        self.delivery_cost = delivery_cost
+        self.stock_out_cost = stock_out_cost
+        self.per_item_cost = np.broadcast_to(np.asarray(per_item_cost, dtype=float), (len(skus),))
+        self._shared = None
+
+    def share(self) -> None:
+        """Moves the demand tensor into shared memory. When the evaluator is pickled (e.g., sent to a worker process), 
+        only the name of the shared memory block is sent and the worker maps the same demand tensor. A demand tensor
+        mapped from a file is already shared through the file and is left in place.
+        """
+        if self._shared is not None or self._mapping is not None:
+            return
+
+        self._shared = shared_memory.SharedMemory(create=True, size=self.demand.nbytes)
+        demand = np.ndarray(self.demand.shape, dtype=self.demand.dtype, buffer=self._shared.buf)
+        demand[:] = self.demand
+        self.demand = demand
+
+    def release(self) -> None:
+        """Copies the demand tensor back into private memory and frees the shared memory block.
+        """
+        if self._shared is None:
+            return
+
+        self.demand = self.demand.copy()
+        self._shared.close()
+        self._shared.unlink()
+        self._shared = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if self._shared is not None:
+            state['demand'] = (self._shared.name, self.demand.shape, self.demand.dtype.str)
+            state['_shared'] = None
+        elif self._mapping is not None:
+            state['demand'] = self._mapping + (self.demand.shape,)
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if isinstance(self.demand, tuple) and self._mapping is not None:
+            filename, offset, dtype, shape = self.demand
+            self.demand = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+        elif isinstance(self.demand, tuple):
+            name, shape, dtype = self.demand
+            # the attached block is owned by the process that shared it
+            self._attached = shared_memory.SharedMemory(name=name)
+            self.demand = np.ndarray(shape, dtype=dtype, buffer=self._attached.buf)
+
+    @staticmethod
+    def sample_lead_times(skus: list,
+                          nr_scenarios: int,
+                          nr_days: int,
+                          spread: int = 1,
+                          seed: int = None) -> np.ndarray:
+        """Samples the lead time of every potential order once, to be shared by all the solutions evaluated. The 
+        lead time of an order is drawn uniformly within spread days of the SKU's lead time.
+
+        Args:
+            skus (list): a list of SKU objects
+            nr_scenarios (int): the number of demand scenarios
+            nr_days (int): the number of days per scenario
+            spread (int, optional): the maximum deviation from the SKU's lead time in days. Defaults to 1.
+            seed (int, optional): seed of the random number generator. Defaults to None.
+
+        Returns:
+            np.ndarray: lead times with dimensions (scenarios, skus, days)
+        """
+        lead_time = np.array([sku.lead_time for sku in skus], dtype=np.int64)[None, :, None]
+        deviation = np.random.default_rng(seed).integers(-spread, spread + 1, size=(nr_scenarios, len(skus), nr_days))
+
+        return np.maximum(lead_time + deviation, 0)
+
+    @staticmethod
+    def encode(population: list) -> tuple:
+        """Encodes a population of solutions as arrays.
+
+        Args:
+            population (list): a list of Individual_Solution objects
+
+        Returns:
+            tuple: policy codes (index in Policy_Factory.options) with dimensions (solutions, skus)
+                   and policy parameters with dimensions (solutions, skus, 2)
+        """
+        codes = np.stack([individual.codes for individual in population])
+        params = np.stack([individual.params for individual in population])
+
+        return codes, params
+
+    def _run_policies(self,
+                      codes: np.ndarray,
+                      params: np.ndarray,
+                      demand: np.ndarray,
+                      starting_inventory: np.ndarray,
+                      lead_time: np.ndarray,
+                      per_item_cost: np.ndarray,
+                      sku_costs: np.ndarray):
+        """Steps policies through the days. All arguments broadcast to the shape of sku_costs, demand and lead_time 
+        have an extra trailing day axis (of length one if the lead time does not change). Holding, stock out and item costs are accumulated into sku_costs.
+
+        Yields:
+            tuple: the day and the quantity ordered by every policy on that day
+        """
+        shape = sku_costs.shape
+        first = params[..., 0].astype(np.int64)
+        second = params[..., 1].astype(np.int64)
+
+        is_minmax = codes == 0
+        is_qr = codes == 1
+        is_periodic = codes == 2
+        # minmax and qr are continuous policies with a daily review
+        review_period = np.where(is_periodic, np.maximum(first, 1), 1)
+        trigger_level = np.where(is_minmax, first, second)
+        order_up_to = np.where(is_qr, 0, second)
+
+        # orders are kept in a flat ring buffer indexed by arrival day and policy
+        nr_slots = int(np.max(lead_time)) + 1
+        size = int(np.prod(shape))
+        pipeline = np.zeros(nr_slots * size, dtype=np.int64)
+        # position in the buffer of an order placed on day 0, shifted by a slot per day
+        offset = np.arange(size).reshape(shape)
+        arrival = np.broadcast_to(lead_time[..., 0], shape) * size + offset
+        varying = lead_time.shape[-1] > 1
+
+        on_hand = np.broadcast_to(starting_inventory, shape).astype(np.int64)
+        on_order = np.zeros(shape, dtype=np.int64)
+
+        for day in range(demand.shape[-1]):
+            
+            # review and order
+            position = on_hand + on_order
+            due = (day % review_period == 0) & (is_periodic | (position <= trigger_level))
+            quantity = np.where(is_qr, first, order_up_to - position)
+            quantity = np.where(due, np.maximum(quantity, 0), 0)
+
+            if varying:
+                arrival = np.broadcast_to(lead_time[..., day], shape) * size + offset
+            pipeline[(arrival + day * size) % pipeline.size] += quantity
+            on_order += quantity
+
+            # receive deliveries
+            arrivals = pipeline[day % nr_slots * size:(day % nr_slots + 1) * size].reshape(shape)
+            on_hand += arrivals
+            on_order -= arrivals
+            arrivals[:] = 0
+
+            # fulfill demand
+            on_hand -= demand[..., day]
+
+            sku_costs += (self.holding_cost * np.maximum(on_hand, 0)
+                          + self.stock_out_cost * (on_hand < 0)
+                          + per_item_cost * quantity)
+            
+            yield day, quantity
+
+    def simulate(self,
+                 codes: np.ndarray,
+                 params: np.ndarray,
+                 order_days: bool = False,
+                 scenarios: slice = slice(None)) -> dict:
+        """Simulates every solution against every demand scenario in one batch.
+
+        Each day, SKUs due for review order based on their inventory position (stock on hand plus orders in the pipeline):
+            minmax: order up to max if the position is at or below min
+            qr: order q_to_order if the position is at or below rop
+            periodic_utp: order up to order_up_to every time_period days
+        Orders arrive after their lead time, then the day's demand is subtracted. Unmet demand is backordered.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (solutions, skus)
+            params (np.ndarray): policy parameters with dimensions (solutions, skus, 2)
+            order_days (bool, optional): whether to return the number of SKUs ordered per supplier and day. Defaults to False.
+            scenarios (slice, optional): the demand scenarios simulated. Defaults to all of them.
+
+        Returns:
+            dict: "sku_costs" - holding, stock out and item costs with dimensions (solutions, scenarios, skus) 
+                  "supplier_costs" - delivery costs with dimensions (solutions, scenarios, suppliers)
+                  "order_days" - if requested, SKUs ordered with dimensions (solutions, scenarios, suppliers, days)
+        """
+        demand = self.demand[scenarios]
+        lead_time = self.lead_time if len(self.lead_time) == 1 else self.lead_time[scenarios]
+        nr_scenarios, nr_skus, nr_days = demand.shape
+        nr_suppliers = self.suppliers.max() + 1
+        shape = (len(codes), nr_scenarios, nr_skus)
+
+        sku_costs = np.zeros(shape)
+        supplier_costs = np.zeros(shape[:2] + (nr_suppliers,))
+        supplier_onehot = np.eye(nr_suppliers)[self.suppliers]
+        if order_days:
+            orders = np.zeros(shape[:2] + (nr_suppliers, nr_days), dtype=np.int16)
+
+        days = self._run_policies(codes[:, None, :], params[:, None], demand, 
+                                  self.starting_inventory, lead_time, self.per_item_cost, sku_costs)
+        
+        for day, quantity in days:
+            ordered = (quantity > 0) @ supplier_onehot
+            supplier_costs += self.delivery_cost * (ordered > 0)
+            if order_days:
+                orders[..., day] = ordered
+
+        costs = {"sku_costs": sku_costs, "supplier_costs": supplier_costs}
+        if order_days:
+            costs["order_days"] = orders
+
+        return costs
+
+    def simulate_genes(self,
+                       codes: np.ndarray,
+                       params: np.ndarray,
+                       sku_index: np.ndarray) -> dict:
+        """Simulates single policies, each for its own SKU, against every demand scenario in one batch.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (policies,)
+            params (np.ndarray): policy parameters with dimensions (policies, 2)
+            sku_index (np.ndarray): the SKU of each policy
+
+        Returns:
+            dict: "sku_costs" - holding, stock out and item costs with dimensions (policies, scenarios) 
+                  "orders" - whether the policy ordered, dimensions (policies, scenarios, days)
+        """
+        nr_scenarios, _, nr_days = self.demand.shape
+        
+        sku_costs = np.zeros((len(codes), nr_scenarios))
+        orders = np.zeros((len(codes), nr_scenarios, nr_days), dtype=bool)
+
+        days = self._run_policies(codes[:, None], params[:, None], self.demand[:, sku_index].transpose(1, 0, 2),
+                                  self.starting_inventory[sku_index, None], self.lead_time[:, sku_index].transpose(1, 0, 2),
+                                  self.per_item_cost[sku_index, None], sku_costs)
+        
+        for day, quantity in days:
+            orders[..., day] = quantity > 0
+
+        return {"sku_costs": sku_costs, "orders": orders}
+
+    def evaluate(self,
+                 codes: np.ndarray,
+                 params: np.ndarray) -> np.ndarray:
+        """Finds the fitness of encoded solutions.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (solutions, skus)
+            params (np.ndarray): policy parameters with dimensions (solutions, skus, 2)
+
+        Returns:
+            np.ndarray: the fitness per solution
+        """
+        costs = self.simulate(codes, params)
+        
+        total_costs = costs["sku_costs"].sum(axis=2) + costs["supplier_costs"].sum(axis=2)
+
+        return total_costs.mean(axis=1)
+
+    def evaluate_adaptive(self,
+                          codes: np.ndarray,
+                          params: np.ndarray,
+                          incumbent: float = None,
+                          batch_size: int = 5,
+                          z: float = 1.96) -> tuple:
+        """Finds the fitness of encoded solutions by simulating the demand scenarios in batches (sequential sampling).
+
+        After each batch, a confidence interval of mean +/- z standard errors is computed per solution. A solution stops
+        being simulated once its interval lies entirely above the incumbent, i.e., it cannot beat it, or entirely below 
+        it, i.e., it clearly beats it. The incumbent is the lower of the one provided and the best mean of the solutions
+        still simulated, which all have been simulated against the same scenarios, so partial means are only compared 
+        with means over as many scenarios, on common random numbers. The solution with the lowest fitness becomes the 
+        next incumbent (and the elite of a GA), so if it beats the incumbent provided, it is simulated against every 
+        scenario before it is finalized, as are the solutions that take its place.
+
+        Args:
+            codes (np.ndarray): policy codes with dimensions (solutions, skus)
+            params (np.ndarray): policy parameters with dimensions (solutions, skus, 2)
+            incumbent (float, optional): the fitness to beat, e.g., the best fitness so far. Defaults to None.
+            batch_size (int, optional): the number of scenarios simulated at a time, at least 2. Defaults to 5.
+            z (float, optional): the half-width of the confidence interval in standard errors. Defaults to 1.96.
+
+        Returns:
+            tuple: the fitness per solution, i.e., its mean cost over the scenarios it was simulated against, 
+                   and the number of scenarios each solution was simulated against
+        """
+        nr_scenarios = len(self.demand)
+        batch_size = max(batch_size, 2)
+        incumbent = np.inf if incumbent is None else incumbent
+        
+        sums = np.zeros(len(codes))
+        squares = np.zeros(len(codes))
+        replications = np.zeros(len(codes), dtype=np.int64)
+        active = np.ones(len(codes), dtype=bool)
+
+        for start in range(0, nr_scenarios, batch_size):
+            index = np.flatnonzero(active)
+            if not len(index):
+                break
+
+            costs = self.simulate(codes[index], params[index], scenarios=slice(start, start + batch_size))
+            total_costs = costs["sku_costs"].sum(axis=2) + costs["supplier_costs"].sum(axis=2)
+            sums[index] += total_costs.sum(axis=1)
+            squares[index] += (total_costs ** 2).sum(axis=1)
+            replications[index] += total_costs.shape[1]
+
+            mean = sums[index] / replications[index]
+            variance = np.maximum(squares[index] - replications[index] * mean ** 2, 0) / np.maximum(replications[index] - 1, 1)
+            half_width = z * np.sqrt(variance / replications[index])
+            
+            reference = min(incumbent, mean.min())
+            decided = (mean - half_width > reference) | (mean + half_width < reference)
+            active[index[decided]] = False
+
+        # the best solution is not finalized on a partial, possibly optimistic mean
+        while True:
+            best = np.argmin(sums / replications)
+            if replications[best] == nr_scenarios or sums[best] / replications[best] >= incumbent:
+                break
+
+            costs = self.simulate(codes[best:best + 1], params[best:best + 1], scenarios=slice(replications[best], nr_scenarios))
+            total_costs = costs["sku_costs"].sum(axis=2) + costs["supplier_costs"].sum(axis=2)
+            sums[best] += total_costs.sum()
+            replications[best] = nr_scenarios
+
+        return sums / replications, replications
+
+    def evaluate_population(self,
+                            population: list) -> np.ndarray:
+        """Finds the fitness of a population of solutions.
+
+        Args:
+            population (list): a list of Individual_Solution objects
+
+        Returns:
+            np.ndarray: the fitness per solution
+        """
+        return self.evaluate(*self.encode(population))
+
+    def _fitness_from_components(self,
+                                 sku_costs: np.ndarray,
+                                 order_days: np.ndarray) -> np.ndarray:
+        
+        total_costs = sku_costs.sum(axis=-1) + self.delivery_cost * (order_days > 0).sum(axis=(-2, -1))
+
+        return total_costs.mean(axis=-1)
+
+    def evaluate_incremental(self,
+                             population: list) -> np.ndarray:
+        """Finds the fitness of a population of solutions, caching per-SKU cost components on each solution.
+
+        A solution without components is simulated in full. A solution whose policies were mutated since its components
+        were cached only has the mutated SKUs re-simulated: SKU costs are independent, except for the delivery cost 
+        shared by the SKUs of a supplier, which is kept as the number of SKUs ordered per supplier and day. The old and 
+        new policies of every mutated SKU across the population are simulated together in one batch.
+
+        Args:
+            population (list): a list of Individual_Solution objects
+
+        Returns:
+            np.ndarray: the fitness per solution
+        """
+        fitness = np.empty(len(population))
+        new = [i for i, individual in enumerate(population) if individual.costs is None]
+        mutated = [i for i, individual in enumerate(population) if individual.costs is not None and individual.mutations]
+
+        for i, individual in enumerate(population):
+            if individual.costs is not None and not individual.mutations:
+                fitness[i] = individual.costs['fitness']
+
+        if new:
+            codes, params = self.encode([population[i] for i in new])
+            costs = self.simulate(codes, params, order_days=True)
+            scores = self._fitness_from_components(costs['sku_costs'], costs['order_days'])
+
+            for j, i in enumerate(new):
+                population[i].costs = {'sku_costs': costs['sku_costs'][j], 
+                                       'order_days': costs['order_days'][j], 
+                                       'fitness': scores[j]}
+            fitness[new] = scores
+
+        if mutated:
+            # one row per mutated SKU: (solution, SKU, policy before the mutations)
+            rows = [(i, loc, old) for i in mutated for loc, old in population[i].mutations.items()]
+            sku_index = np.array([loc for _, loc, _ in rows])
+            codes = np.array([old[0] for _, _, old in rows] + [population[i].codes[loc] for i, loc, _ in rows], dtype=np.int8)
+            params = np.array([old[1] for _, _, old in rows] + [population[i].params[loc] for i, loc, _ in rows], dtype=np.int32)
+            
+            genes = self.simulate_genes(codes, params, np.concatenate([sku_index, sku_index]))
+            old_orders, new_orders = np.split(genes['orders'].astype(np.int16), 2)
+            new_costs = genes['sku_costs'][len(rows):]
+
+            # the cached arrays may be shared with copies of the solution, so they are replaced rather than updated
+            updated = {i: {'sku_costs': population[i].costs['sku_costs'].copy(), 
+                           'order_days': population[i].costs['order_days'].copy()} for i in mutated}
+            
+            for row, (i, loc, _) in enumerate(rows):
+                updated[i]['sku_costs'][:, loc] = new_costs[row]
+                updated[i]['order_days'][:, self.suppliers[loc]] += new_orders[row] - old_orders[row]
+
+            for i in mutated:
+                updated[i]['fitness'] = self._fitness_from_components(updated[i]['sku_costs'], updated[i]['order_days'])
+                population[i].costs = updated[i]
+                population[i].mutations = {}
+                fitness[i] = updated[i]['fitness']
+
+        return fitness
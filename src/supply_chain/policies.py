@@ -1,9 +1,105 @@
 from abc import ABCMeta, abstractmethod
+import numpy as np
 import GA_core as ga_opt
 import supply_chain as sc
 
 
+def random_params(codes: np.ndarray,
+                  capacity: np.ndarray,
+                  rng: np.random.Generator) -> np.ndarray:
+    """Draws random policy parameters within the SKUs' capacity.
+
+    Args:
+        codes (np.ndarray): policy codes (index in Policy_Factory.options), any shape
+        capacity (np.ndarray): capacity of the SKU, broadcastable to codes
+        rng (np.random.Generator): random number generator
+
+    Returns:
+        np.ndarray: int32 parameters with dimensions codes.shape + (2,)
+    """
+    capacity = np.broadcast_to(capacity, codes.shape)
+    periods = Periodic_Up_To_Point.review_periods
+
+    level = rng.integers(0, capacity + 1)
+    # minmax: 0 <= min <= max <= capacity
+    minmax = (level, rng.integers(level, capacity + 1))
+    # qr: 1 <= q_to_order <= capacity, 0 <= rop <= capacity
+    qr = (rng.integers(1, np.maximum(capacity, 1) + 1), level)
+    # periodic_utp: time_period from review_periods, 0 <= order_up_to <= capacity
+    periodic = (rng.integers(periods.start, periods.stop, size=codes.shape), level)
+
+    params = np.empty(codes.shape + (2,), dtype=np.int32)
+    for i in range(2):
+        params[..., i] = np.choose(codes, (minmax[i], qr[i], periodic[i]))
+
+    return params
+
+
 class Policy(metaclass=ABCMeta):
+    """A policy is a lightweight view of one row of a solution's parameter matrix. 
+    A policy created on its own gets a one-row matrix of its own.
+
+    Attributes:
+        sku (SKU): SKU object
+    """
+
+    __slots__ = ('sku', '_params', '_loc', '_solution')
+
+    def __init__(self,
+                 sku: sc.SKU,
+                 first: int = 0,
+                 second: int = 0) -> None:
+        self.sku = sku
+        self._params = np.array([[first, second]], dtype=np.int32)
+        self._loc = 0
+        self._solution = None
+
+    @classmethod
+    def view(cls,
+             sku: sc.SKU,
+             params: np.ndarray,
+             loc: int,
+             solution: 'sc.Individual_Solution' = None) -> 'Policy':
+        """Creates a policy backed by a row of a parameter matrix.
+
+        Args:
+            sku (SKU): SKU object
+            params (np.ndarray): parameter matrix with dimensions (skus, 2)
+            loc (int): the row of the policy
+            solution (Individual_Solution, optional): the solution owning the matrix, told about changes. Defaults to None.
+
+        Returns:
+            Policy: the policy, changes to its attributes are written to the matrix
+        """
+        policy = cls.__new__(cls)
+        policy.sku = sku
+        policy._params = params
+        policy._loc = loc
+        policy._solution = solution
+
+        return policy
+
+    def _get(self, i: int) -> int:
+        return int(self._params[self._loc, i])
+
+    def _set(self, i: int, value: int) -> None:
+        if self._solution is not None:
+            self._solution.record_mutation(self._loc)
+        self._params[self._loc, i] = value
+
+    def _mutate(self, 
+                first: int, 
+                second: int) -> None:
+        """Updates the parameters provided, draws both at random if neither is.
+        """
+        if first is None and second is None:
+            code = np.array(sc.Policy_Factory.options.index(self.name))
+            first, second = random_params(code, self.sku.capacity, np.random.default_rng())
+
+        if first is not None:
+            self._set(0, first)
+        if second is not None:
+            self._set(1, second)
 
     @abstractmethod
     def get_params(self) -> dict:
@@ -28,7 +124,7 @@ class MinMax(Policy, ga_opt.Gene):
         max (int, optional): maximum order-up-to point. Set to 0 by default.
     """
 
-
+    __slots__ = ()
     name = 'minmax'
     
     def __init__(self, 
@@ -42,10 +138,10 @@ class MinMax(Policy, ga_opt.Gene):
             min (int, optional): minimum reordering point. Set to 0 by default.
             max (int, optional): maximum order-up-to point. Set to 0 by default.
         """
-        self.sku = sku
-        self.min = min
-        self.max = max
+        super().__init__(sku, min, max)
 
+    min = property(lambda self: self._get(0), lambda self, value: self._set(0, value))
+    max = property(lambda self: self._get(1), lambda self, value: self._set(1, value))
     
     def get_params(self) -> dict:
         """Returns class attributes as a dictionary.
@@ -53,18 +149,19 @@ class MinMax(Policy, ga_opt.Gene):
         Returns:
             dict: returns a dictionary with the attributes of the class
         """
-        pass
+        return {'min': self.min, 'max': self.max}
 
     def mutate_gene(self, 
                       min:int = None, 
                       max: int = None)  -> None:
-        """Update min and/ or max class attributes 
+        """Update min and/ or max class attributes. If neither is provided, both are drawn at random
+        so that 0 <= min <= max <= the SKU's capacity.
 
         Args:
             min (int, optional): the new min value to be updated. Defaults to None.
             max (int, optional): the new max value to be updated. Defaults to None.
         """
-        pass
+        self._mutate(min, max)
 
 
 class QR(Policy, ga_opt.Gene):
@@ -79,6 +176,7 @@ class QR(Policy, ga_opt.Gene):
         rop (int, optional): the reordering point. Defaults to 0.        
     """
 
+    __slots__ = ()
     name = 'qr'
 
     def __init__(self, 
@@ -92,10 +190,10 @@ class QR(Policy, ga_opt.Gene):
             q_to_order (int, optional): the quantity to order. Defaults to 0.
             rop (int, optional): the reordering point. Defaults to 0.
         """
-        self.sku = sku
-        self.q_to_order = q_to_order
-        self.rop = rop
+        super().__init__(sku, q_to_order, rop)
 
+    q_to_order = property(lambda self: self._get(0), lambda self, value: self._set(0, value))
+    rop = property(lambda self: self._get(1), lambda self, value: self._set(1, value))
 
     def get_params(self) -> dict:
         """Returns class attributes as a dictionary.
@@ -103,18 +201,19 @@ class QR(Policy, ga_opt.Gene):
         Returns:
             dict: returns a dictionary with the attributes of the class
         """        
-        pass
+        return {'q_to_order': self.q_to_order, 'rop': self.rop}
 
     def mutate_gene(self, 
                       q_to_order:int = None,
                       rop:int = None)  -> None:
-        """Update q_to_order and/or rop class attributes.
+        """Update q_to_order and/or rop class attributes. If neither is provided, both are drawn at random
+        within the SKU's capacity.
 
         Args:
             q_to_order (int, optional): the new q_to_order value to be updated. Defaults to None.
             rop (int, optional): the new rop value to be updated. Defaults to None.
         """
-        pass
+        self._mutate(q_to_order, rop)
 
 
 class Periodic_Up_To_Point(Policy, ga_opt.Gene):
@@ -129,8 +228,9 @@ class Periodic_Up_To_Point(Policy, ga_opt.Gene):
         order_up_to (int, optional): Order-up-to quantity. Defaults to 0.       
     """
 
-    
+    __slots__ = ()
     name = 'periodic_utp'
+    review_periods = range(1, 30)
 
     def __init__(self, 
                  sku: sc.SKU,
@@ -143,10 +243,10 @@ class Periodic_Up_To_Point(Policy, ga_opt.Gene):
             time_period (int, optional): Frequency of inventory reviews. Defaults to 0.
             order_up_to (int, optional): Order-up-to quantity. Defaults to 0.
         """
-        self.sku = sku
-        self.time_period = time_period
-        self.order_up_to = order_up_to
+        super().__init__(sku, time_period, order_up_to)
 
+    time_period = property(lambda self: self._get(0), lambda self, value: self._set(0, value))
+    order_up_to = property(lambda self: self._get(1), lambda self, value: self._set(1, value))
 
     def get_params(self) -> dict:
         """Returns class attributes as a dictionary.
@@ -154,22 +254,24 @@ class Periodic_Up_To_Point(Policy, ga_opt.Gene):
         Returns:
             dict: returns a dictionary with the attributes of the class
         """        
-        pass
+        return {'time_period': self.time_period, 'order_up_to': self.order_up_to}
 
     def mutate_gene(self, 
                       time_period:int = None,
                       order_up_to:int = None) -> None:
-        """Update time_period and/or order_up_to class attributes.
+        """Update time_period and/or order_up_to class attributes. If neither is provided, both are drawn at random,
+        the time period from review_periods and the order-up-to quantity within the SKU's capacity.
 
         Args:
             time_period (int, optional): the new time_period value to be updated. Defaults to None.
             order_up_to (int, optional): the new order_up_to value to be updated. Defaults to None.
         """
-        pass
+        self._mutate(time_period, order_up_to)
 
 
 class Policy_Factory:
     options = ['minmax', 'qr', 'periodic_utp'] 
+    policies = [MinMax, QR, Periodic_Up_To_Point]
 
     @staticmethod
     def create_policy(type: str, 
@@ -184,4 +286,3 @@ class Policy_Factory:
         
         else: raise ValueError("Policy type not valid")
 
-
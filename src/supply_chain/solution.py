@@ -1,65 +1,132 @@
-import random
+import numpy as np
 import GA_core as ga_opt
 import supply_chain as sc
 
 class Individual_Solution(ga_opt.Chromosome):
     """A class representing an inidividual solution (i.e., a collection of policies)
 
+    The policies are stored compactly: a policy code per SKU (index in Policy_Factory.options) and
+    a two-column parameter matrix, e.g., (min, max) for minmax. The arrays may be views into
+    population-wide arrays.
+
     Attributes:
-        skus (list): a list of SKU_Type objects 
+        skus (list): a list of SKU objects
+        codes (np.ndarray): int8 policy code per SKU
+        params (np.ndarray): int32 policy parameters with dimensions (skus, 2)
+        costs (dict): per-SKU cost components cached by Fitness_Evaluator.evaluate_incremental, None if not evaluated
+        mutations (dict): policies (code, parameters) before their first mutation since the costs were cached, keyed by SKU position
     """
 
-    def __init__(self) -> None:
+    __slots__ = ('skus', 'codes', 'params', 'costs', 'mutations')
+
+    def __init__(self,
+                 skus: list = None,
+                 codes: np.ndarray = None,
+                 params: np.ndarray = None) -> None:
         """A constructor for the Individual_Solution class.
 
+        Args:
+            skus (list, optional): a list of SKU objects. Defaults to no SKUs.
+            codes (np.ndarray, optional): policy code per SKU. Defaults to None.
+            params (np.ndarray, optional): policy parameters with dimensions (skus, 2). Defaults to None.
         """
-        self.solution = []
-        pass
-        
+        self.skus = skus if skus is not None else []
+        self.codes = codes if codes is not None else np.zeros(len(self.skus), dtype=np.int8)
+        self.params = params if params is not None else np.zeros((len(self.skus), 2), dtype=np.int32)
+        self.costs = None
+        self.mutations = {}
+
+    @property
+    def solution(self) -> list:
+        """The policies of the solution, as views of the parameter matrix.
+        """
+        policies = sc.Policy_Factory.policies
+
+        return [policies[code].view(sku, self.params, loc, self) for loc, (code, sku) in enumerate(zip(self.codes, self.skus))]
         
     def solution_initialize(self,
-                            skus: list) -> None:
+                            skus: list,
+                            rng: np.random.Generator = None) -> 'Individual_Solution':
 
-        """Initialise the solution
+        """Initialise the solution with a random policy per SKU
         
         Args:
             skus (list): a list of SKU_Type objects 
+            rng (np.random.Generator, optional): random number generator. Defaults to a new generator.
+
+        Returns:
+            Individual_Solution: the initialised solution
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        capacity = np.array([sku.capacity for sku in skus])
         
+        self.skus = skus
+        # select a random policy type per SKU and its parameters
+        self.codes = rng.integers(0, len(sc.Policy_Factory.options), size=len(skus), dtype=np.int8)
+        self.params = sc.random_params(self.codes, capacity, rng)
+        self.costs = None
+        self.mutations = {}
+
+        return self
+
+    def copy(self) -> 'Individual_Solution':
+
+        """Copies the solution, the SKUs and cached cost components are shared
+
+        Returns:
+            Individual_Solution: the copy
         """
+        child = Individual_Solution(self.skus, self.codes.copy(), self.params.copy())
+        child.costs = self.costs
+        child.mutations = dict(self.mutations)
 
-        solution = [] # policies will go here
-       
-        policy_factory = sc.Policy_Factory()
+        return child
 
-        for sku in skus:
-            # select a random policy type
-            policy_type = random.choice(policy_factory.options)
-            # create a policy
-            policy = policy_factory.create_policy(policy_type, sku)
-            # add to the solution
-            solution.append(policy)
+    def record_mutation(self,
+                        loc: int) -> None:
 
-        return solution
+        """Records the policy at a location before it changes, so that only the SKUs that changed are re-simulated
+
+        Args:
+            loc (int): location of the policy
+        """
+        if self.costs is not None and loc not in self.mutations:
+            self.mutations[loc] = (self.codes[loc], self.params[loc].copy())
 
+    def genotype(self) -> bytes:
 
+        """Encodes the policy codes and parameters of the solution
 
+        Returns:
+            bytes: the genotype of the solution
+        """
+        return self.codes.tobytes() + self.params.tobytes()
 
-    def solution_evaluation(self) -> float:
+    def solution_evaluation(self,
+                            fitness_func) -> float:
 
         """Evaluate the fitness of the solution
 
+        Args:
+            fitness_func (Fitness_Evaluator): the evaluator simulating the solution
+
         Returns:
             float: the fitness of the solution
         """
-        pass
+        return float(fitness_func.evaluate_population([self])[0])
 
     def mutate_chrom(self,
-               loc: int) -> None:
+               loc: int,
+               rng: np.random.Generator = None) -> None:
         
-        """Mutates a policy in the solution
+        """Mutates a policy in the solution by replacing it with a random policy for the same SKU
 
         Args:
             loc (int): location of the mutation
+            rng (np.random.Generator, optional): random number generator. Defaults to a new generator.
         """
+        rng = rng if rng is not None else np.random.default_rng()
+        self.record_mutation(loc)
 
-        pass
\ No newline at end of file
+        self.codes[loc] = rng.integers(0, len(sc.Policy_Factory.options))
+        self.params[loc] = sc.random_params(self.codes[loc], self.skus[loc].capacity, rng)
@@ -1 +1,2 @@
-from utilities.demand_generator import Demand_Gen
\ No newline at end of file
+from utilities.demand_generator import Demand_Factory
+from utilities.scenario_bank import Scenario_Bank
@@ -1,7 +1,6 @@
 from abc import ABC, abstractmethod
 import numpy as np
 import pandas as pd
-import random
 
 class Demand(ABC):
     """A class representing the demand interface.
@@ -11,86 +10,114 @@ class Demand(ABC):
     """
     
     @abstractmethod
-    def generate(self) -> None:
+    def generate(self,
+                 nr_skus: int = 1,
+                 weeks: int = 50,
+                 rng: np.random.Generator = None) -> np.ndarray:
         """Placeholder method for demand generation.
+
+        Args:
+            nr_skus (int, optional): the number of SKUs. Defaults to 1.
+            weeks (int, optional): the number of data points per SKU. Defaults to 50.
+            rng (np.random.Generator, optional): random number generator. Defaults to a new generator.
+
+        Returns:
+            np.ndarray: integer demand with dimensions (nr_skus, weeks)
         """
         pass
 
 
-class Demand_Random(DemandInterface):
+class Demand_Random(Demand):
     """A class used to represent random demand.
 
     Args:
-        DemandInterface (class): Abstract parent class
+        Demand (class): Abstract parent class
     """
     
     def generate(self,
-                 weeks = 50) -> list:
+                 nr_skus: int = 1,
+                 weeks: int = 50,
+                 rng: np.random.Generator = None) -> np.ndarray:
         """Generates random demand.  
 
         Args:
-            weeks (int, optional): the number of data points in the demand list. Defaults to 50.
+            nr_skus (int, optional): the number of SKUs. Defaults to 1.
+            weeks (int, optional): the number of data points per SKU. Defaults to 50.
+            rng (np.random.Generator, optional): random number generator. Defaults to a new generator.
 
         Returns:
-            list: a list of integers representing random demand
+            np.ndarray: integer random demand with dimensions (nr_skus, weeks)
         """
+        rng = rng if rng is not None else np.random.default_rng()
         
-        trend = [random.uniform(1.0, 3) for _ in range(weeks)]
-        seasonality = [random.uniform(0.8, 1.2) for _ in range(weeks)]  
+        trend = rng.uniform(1.0, 3, size=(nr_skus, weeks))
+        seasonality = rng.uniform(0.8, 1.2, size=(nr_skus, weeks))
         
-        return [int(100 * trend[i] * seasonality[i]) for i in range(weeks)]
+        return (100 * trend * seasonality).astype(np.int64)
 
 
-class Demand_Trend(DemandInterface):
+class Demand_Trend(Demand):
     """A class used to represent demand with a trend.
 
     Args:
-        DemandInterface (class): Abstract parent class
+        Demand (class): Abstract parent class
     """
     
     def generate(self,
-                 weeks = 50, 
-                 trend_coeff=0.1) -> list:
+                 nr_skus: int = 1,
+                 weeks: int = 50, 
+                 rng: np.random.Generator = None,
+                 trend_coeff = 0.1) -> np.ndarray:
         """Generates demand with a trend.  
 
         Args:
-            weeks (int, optional): the number of data points in the demand list. Defaults to 50.
-            trend_coeff (float, optional): a coefficient to adjust the slope of the trend. Defaults to 0.1.    
+            nr_skus (int, optional): the number of SKUs. Defaults to 1.
+            weeks (int, optional): the number of data points per SKU. Defaults to 50.
+            rng (np.random.Generator, optional): random number generator. Defaults to a new generator.
+            trend_coeff (float or np.ndarray, optional): a coefficient to adjust the slope of the trend, a scalar or one per SKU. Defaults to 0.1.    
 
         Returns:
-            list: a list of integers representing demand with a trend.
+            np.ndarray: integer demand with a trend with dimensions (nr_skus, weeks)
         """
+        rng = rng if rng is not None else np.random.default_rng()
+        trend_coeff = np.broadcast_to(np.asarray(trend_coeff, dtype=float), (nr_skus,))[:, None]
         
-        trend = [random.uniform(1.0, 3) + trend_coeff*x for x in range(weeks)]
-        seasonality = [random.uniform(0.8, 1.2) for _ in range(weeks)]  
+        trend = rng.uniform(1.0, 3, size=(nr_skus, weeks)) + trend_coeff * np.arange(weeks)
+        seasonality = rng.uniform(0.8, 1.2, size=(nr_skus, weeks))
         
-        return [int(100 * trend[i] * seasonality[i]) for i in range(weeks)]
+        return (100 * trend * seasonality).astype(np.int64)
 
 
-class Demand_Seasonal(DemandInterface):
+class Demand_Seasonal(Demand):
     """A class used to represent seasonal demand.
 
     Args:
-        DemandInterface (class): Abstract parent class
+        Demand (class): Abstract parent class
     """
     
     def generate(self, 
-                 weeks = 50,
-                 freq_coeff=0.2) -> list:
+                 nr_skus: int = 1,
+                 weeks: int = 50,
+                 rng: np.random.Generator = None,
+                 freq_coeff = 0.2) -> np.ndarray:
         """Generates seasonal demand. 
 
         Args:
-            weeks (int, optional): the number of data points in the demand list. Defaults to 50.
-            freq_coeff (float, optional): a coefficient to adjust the frequency of the seasonality. Defaults to 0.2.
+            nr_skus (int, optional): the number of SKUs. Defaults to 1.
+            weeks (int, optional): the number of data points per SKU. Defaults to 50.
+            rng (np.random.Generator, optional): random number generator. Defaults to a new generator.
+            freq_coeff (float or np.ndarray, optional): a coefficient to adjust the frequency of the seasonality, a scalar or one per SKU. Defaults to 0.2.
 
         Returns:
-            list: a list of integers representing seasonal demand.
+            np.ndarray: integer seasonal demand with dimensions (nr_skus, weeks)
         """
+        rng = rng if rng is not None else np.random.default_rng()
+        freq_coeff = np.broadcast_to(np.asarray(freq_coeff, dtype=float), (nr_skus,))[:, None]
         
-        trend = [random.uniform(1.0, 3) for _ in range(weeks)]
-        seasonality = [np.sin(freq_coeff*x) + 1 for x in range(weeks)]  
+        trend = rng.uniform(1.0, 3, size=(nr_skus, weeks))
+        seasonality = np.sin(freq_coeff * np.arange(weeks)) + 1
         
-        return [int(100 * trend[i] * seasonality[i]) for i in range(weeks)]
+        return (100 * trend * seasonality).astype(np.int64)
 
 
 
@@ -98,22 +125,28 @@ class Demand_Factory():
     """A class implementing the factory design pattern.
     """
     
+    options = {'random': Demand_Random, 
+               'trend': Demand_Trend, 
+               'seasonal': Demand_Seasonal}
 
     def __init__(self, 
-                 weeks:int) -> None:
-        """A constructor for the Demand_Gen class.
+                 weeks:int,
+                 seed: int = None) -> None:
+        """A constructor for the Demand_Factory class.
 
         Args:
             weeks (int): the number of weeks demand must be generated for.
+            seed (int, optional): seed of the random number generator, the same seed always gives the same demand. Defaults to None.
         """
         self.period = weeks
+        self.rng = np.random.default_rng(seed)
         
         
     def generate(self,
                  nr_skus:int,
                  split:list, 
                  type:list) -> pd.DataFrame:
-        """Generated demand according to the type specified.
+        """Generated demand according to the type specified. The demand of each split is generated as one block.
 
         Args:
             nr_skus (int): the number of items
@@ -135,24 +168,12 @@ class Demand_Factory():
         if sum(split) != nr_skus:
             raise ValueError("The split do not sum up to the total number of SKUs")
         
+        if any(demand not in self.options for demand in type):
+            raise ValueError('Invalid demand type')
+        
         columns = ['week_' + str(x) for x in range(self.period)]  # column headers      
-        data = [] # demands will go here
-
-        for i, demand in enumerate(type):
-            if demand == 'random':
-                for _ in range(split[i]):
-                    data.append(Demand_Random().generate(weeks=self.period))
-
-            elif demand == 'trend':
-                for _ in range(split[i]):
-                    data.append(Demand_Trend.generate(weeks=self.period))
-            
-            elif demand == 'seasonal':
-                for _ in range(split[i]):
-                    data.append(Demand_Seasonal().generate(weeks=self.period))
-            
-            else: 
-                raise ValueError('Invalid demand type')
+        data = np.concatenate([self.options[demand]().generate(nr_skus=split[i], weeks=self.period, rng=self.rng) 
+                               for i, demand in enumerate(type)])
         
         # creat a column for skus    
         skus = pd.DataFrame({'skus' : ['sku'+str(x) for x in range(nr_skus)]}) 
@@ -162,13 +183,3 @@ class Demand_Factory():
         df_demand = skus.join(df_demand)
 
         return df_demand
-
-
-weekss=50
-test = Demand_Gen(weeks=weekss).generate(10, [9, 1], ['seasonal', 'random'])
-
-print(test)
-
-
-
-
@@ -0,0 +1,137 @@
+import json
+import numpy as np
+
+class Scenario_Bank():
+    """A class storing Monte-Carlo demand scenarios in a memory-mapped file.
+
+    The scenarios are generated once and kept on disk as a (scenarios, skus, days) int32 .npy array, with a JSON
+    sidecar holding the distribution, its parameters and the seed. Slices are read straight from the mapped file,
+    so several processes can map the same bank without copying it.
+
+    Attributes:
+        path (str): path of the .npy file
+        metadata (dict): distribution, parameters, seed and shape of the scenarios
+        demand (np.memmap): read-only demand per scenario, SKU and day, dimensions (scenarios, skus, days)
+    """
+
+    distributions = ['poisson', 'normal']
+
+    def __init__(self,
+                 path: str) -> None:
+        """A constructor for the Scenario_Bank class, maps an existing bank read-only.
+
+        Args:
+            path (str): path of the .npy file
+        """
+        self.path = path
+        with open(self.metadata_path(path)) as file:
+            self.metadata = json.load(file)
+        self.demand = np.load(path, mmap_mode='r')
+
+    @staticmethod
+    def metadata_path(path: str) -> str:
+        """Returns the path of the metadata sidecar of a bank.
+
+        Args:
+            path (str): path of the .npy file
+
+        Returns:
+            str: path of the JSON metadata
+        """
+        return path + '.json'
+
+    @classmethod
+    def create(cls,
+               path: str,
+               nr_scenarios: int,
+               nr_skus: int,
+               nr_days: int,
+               distribution: str = 'poisson',
+               mean = 10,
+               sd = 1,
+               seed: int = None,
+               chunk_size: int = 64) -> 'Scenario_Bank':
+        """Generates a bank of demand scenarios and writes it to disk chunk by chunk.
+
+        Args:
+            path (str): path of the .npy file
+            nr_scenarios (int): the number of demand scenarios
+            nr_skus (int): the number of SKUs
+            nr_days (int): the number of days per scenario
+            distribution (str, optional): 'poisson' or 'normal'. Defaults to 'poisson'.
+            mean (float or list, optional): mean demand, a scalar or one per SKU. Defaults to 10.
+            sd (float or list, optional): standard deviation of the demand, used by the normal distribution. Defaults to 1.
+            seed (int, optional): seed of the random number generator. Defaults to None, fresh entropy from the OS is
+                then used and recorded as the seed, so the bank can be regenerated and has an identifier of its own.
+            chunk_size (int, optional): the number of scenarios generated at a time. Defaults to 64.
+
+        Raises:
+            ValueError: raises an error if an invalid distribution is provided
+
+        Returns:
+            Scenario_Bank: the bank mapped read-only
+        """
+        if distribution not in cls.distributions:
+            raise ValueError('Invalid demand distribution')
+
+        mean = np.broadcast_to(np.asarray(mean, dtype=float), (nr_skus,))
+        sd = np.broadcast_to(np.asarray(sd, dtype=float), (nr_skus,))
+        rng = np.random.default_rng(seed)
+        if seed is None:
+            seed = rng.bit_generator.seed_seq.entropy
+
+        demand = np.lib.format.open_memmap(path, mode='w+', dtype=np.int32, shape=(nr_scenarios, nr_skus, nr_days))
+        for start in range(0, nr_scenarios, chunk_size):
+            size = (min(chunk_size, nr_scenarios - start), nr_skus, nr_days)
+            if distribution == 'poisson':
+                block = rng.poisson(lam=mean[:, None], size=size)
+            else:
+                block = np.rint(rng.normal(loc=mean[:, None], scale=sd[:, None], size=size)).clip(min=0)
+            demand[start:start + size[0]] = block
+        demand.flush()
+        del demand
+
+        metadata = {'distribution': distribution,
+                    'params': {'mean': mean.tolist(), 'sd': sd.tolist()},
+                    'seed': seed,
+                    'shape': [nr_scenarios, nr_skus, nr_days]}
+        with open(cls.metadata_path(path), 'w') as file:
+            json.dump(metadata, file)
+
+        return cls(path)
+
+    @property
+    def scenario_id(self) -> str:
+        """An identifier of the scenarios, used to key cached fitness values.
+        """
+        return json.dumps(self.metadata, sort_keys=True)
+
+    def __len__(self) -> int:
+        return self.demand.shape[0]
+
+    def scenarios(self,
+                  start: int = 0,
+                  stop: int = None) -> np.memmap:
+        """Maps a contiguous range of scenarios without copying them. The result is a memory map of its own, so an
+        evaluator holding it is pickled as a reference to the file rather than as data.
+
+        Args:
+            start (int, optional): the first scenario. Defaults to 0.
+            stop (int, optional): the scenario after the last one. Defaults to the end of the bank.
+
+        Returns:
+            np.memmap: read-only demand with dimensions (stop - start, skus, days)
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        offset = self.demand.offset + start * self.demand.strides[0]
+        return np.memmap(self.path, dtype=self.demand.dtype, mode='r', offset=offset,
+                         shape=(stop - start,) + self.demand.shape[1:])
+
+    def __getstate__(self) -> dict:
+        """Pickles the bank as its path, the receiving process maps the same file.
+        """
+        return {'path': self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['path'])
@@ -0,0 +1,48 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import GA_core as ga_opt
+import supply_chain as sc
+
+
+@pytest.fixture
+def skus() -> list:
+    return [sc.SKU("sku_" + str(i), 50, 2 + i % 3, 200) for i in range(6)]
+
+
+@pytest.fixture
+def evaluator(skus) -> sc.Fitness_Evaluator:
+    demand = np.random.default_rng(1).poisson(10, (20, len(skus), 30))
+
+    return sc.Fitness_Evaluator(skus=skus, demand=demand, suppliers=[0, 0, 1, 1, 2, 2])
+
+
+@pytest.fixture
+def make_ga(evaluator, skus):
+    """Returns a function building a seeded GA with a fresh population of 30 solutions.
+    """
+    def make(**kwargs) -> ga_opt.Genetic_Algorithm:
+        ga = ga_opt.Genetic_Algorithm(fitness_func=evaluator, seed=3, **kwargs)
+        ga.create_population(size=30, skus=skus)
+        return ga
+
+    return make
+
+
+class Recorder:
+    """An observer keeping every Generation_Stats record it receives.
+    """
+    def __init__(self) -> None:
+        self.records = []
+
+    def update(self, stats, best_solution) -> None:
+        self.records.append(stats)
+
+
+@pytest.fixture
+def recorder() -> Recorder:
+    return Recorder()
@@ -0,0 +1,32 @@
+import numpy as np
+
+
+def test_adaptive_with_one_batch_equals_full_evaluation(make_ga, evaluator):
+    codes, params = evaluator.encode(make_ga().population)
+    fitness, replications = evaluator.evaluate_adaptive(codes, params, batch_size=len(evaluator.demand))
+
+    assert np.allclose(fitness, evaluator.evaluate(codes, params))
+    assert (replications == len(evaluator.demand)).all()
+
+
+def test_adaptive_finalizes_the_best_on_every_scenario(make_ga, evaluator):
+    codes, params = evaluator.encode(make_ga().population)
+    full = evaluator.evaluate(codes, params)
+
+    for incumbent in [None, np.sort(full)[3]]:
+        fitness, replications = evaluator.evaluate_adaptive(codes, params, incumbent, batch_size=2)
+        best = np.argmin(fitness)
+
+        assert replications[best] == len(evaluator.demand)
+        assert np.isclose(fitness[best], full[best])
+        assert replications.sum() < len(codes) * len(evaluator.demand)
+
+
+def test_adaptive_run_reports_replications_avoided(make_ga, evaluator, recorder):
+    ga = make_ga(adaptive_batch=4)
+    ga.create_observer(recorder)
+    ga.run_genetic(generations=5)
+
+    assert recorder.records[-1].replications_avoided == ga.replications_avoided > 0
+    best = int(np.argmin(ga.fitness))
+    assert np.isclose(ga.fitness[best], evaluator.evaluate_population([ga.population[best]])[0])
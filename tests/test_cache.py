@@ -0,0 +1,50 @@
+import numpy as np
+import GA_core as ga_opt
+
+
+def test_cache_hit_returns_same_fitness(make_ga):
+    ga = make_ga(cache_size=100)
+    first = ga.evaluate_population().copy()
+    misses = ga.cache.misses
+
+    second = ga.evaluate_population()
+
+    assert np.array_equal(first, second)
+    assert ga.cache.misses == misses
+    assert ga.cache.hits == len(ga.population)
+
+
+def test_cached_run_matches_uncached_run(make_ga):
+    cached = make_ga(cache_size=100)
+    cached.run_genetic(generations=5)
+    uncached = make_ga()
+    uncached.run_genetic(generations=5)
+
+    assert np.allclose(cached.fitness, uncached.fitness)
+    assert cached.evaluations < uncached.evaluations
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ga_opt.Fitness_Cache(max_size=2)
+    cache.put(b"a" * 16, 1.0)
+    cache.put(b"b" * 16, 2.0)
+    cache.get(b"a" * 16)
+    cache.put(b"c" * 16, 3.0)
+
+    assert cache.get(b"b" * 16) is None
+    assert cache.get(b"a" * 16) == 1.0
+
+
+def test_cache_state_round_trip():
+    cache = ga_opt.Fitness_Cache(max_size=10)
+    # keys ending in a null byte must survive the round trip
+    keys = [bytes([i] * 15 + [0]) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, float(i))
+    cache.get(keys[0])
+
+    restored = ga_opt.Fitness_Cache(max_size=10)
+    restored.set_state(cache.get_state())
+
+    assert list(restored._scores.items()) == list(cache._scores.items())
+    assert (restored.hits, restored.misses) == (cache.hits, cache.misses)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from conftest import Recorder
+
+
+@pytest.mark.parametrize("options", [{}, 
+                                     {"cache_size": 100}, 
+                                     {"cache_size": 100, "incremental": True}, 
+                                     {"adaptive_batch": 5}, 
+                                     {"surrogate_fraction": 0.5}])
+def test_resume_reproduces_uninterrupted_run(make_ga, recorder, tmp_path, options):
+    path = str(tmp_path / "checkpoint.npz")
+
+    full = make_ga(**options)
+    full.create_observer(recorder)
+    full.run_genetic(generations=10)
+
+    make_ga(**options).run_genetic(generations=5, checkpoint_path=path, checkpoint_interval=5)
+    resumed = make_ga(**options)
+    resumed_recorder = Recorder()
+    resumed.create_observer(resumed_recorder)
+    resumed.run_genetic(generations=10, resume_from=path)
+
+    assert [record.generation for record in resumed_recorder.records] == [5, 6, 7, 8, 9]
+    assert np.array_equal(full.fitness, resumed.fitness)
+    assert resumed.evaluations == full.evaluations
+    # the counters carry on from the checkpoint
+    for field in ("best_score", "evaluations", "cache_hits", "cache_misses", "replications_avoided", "evaluations_saved"):
+        assert getattr(resumed_recorder.records[-1], field) == getattr(recorder.records[-1], field)
+
+
+def test_resume_rebuilds_incremental_costs(make_ga, tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    saved = make_ga(incremental=True)
+    saved.run_genetic(generations=2, checkpoint_path=path, checkpoint_interval=2)
+
+    resumed = make_ga(incremental=True)
+    resumed.load_checkpoint(path)
+
+    assert all(individual.costs is not None for individual in resumed.population)
+    assert np.allclose([individual.costs['fitness'] for individual in resumed.population], resumed.fitness)
+    # rebuilding the costs is not counted as evaluations
+    assert resumed.evaluations == saved.evaluations
+
+
+def test_resume_without_surrogate_state_raises(make_ga, tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+    make_ga().run_genetic(generations=2, checkpoint_path=path, checkpoint_interval=2)
+
+    with pytest.raises(ValueError):
+        make_ga(surrogate_fraction=0.5).load_checkpoint(path)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+import GA_core as ga_opt
+
+
+def test_incremental_fitness_equals_full_evaluation(make_ga, evaluator):
+    ga = make_ga()
+    evaluator.evaluate_incremental(ga.population)
+
+    rng = np.random.default_rng(0)
+    for individual in ga.population[:20]:
+        # several mutations, some at the same SKU, between evaluations
+        for loc in rng.integers(0, len(individual.codes), size=3):
+            individual.mutate_chrom(loc, rng)
+
+    incremental = evaluator.evaluate_incremental(ga.population)
+
+    assert all(not individual.mutations for individual in ga.population)
+    assert np.allclose(incremental, evaluator.evaluate_population(ga.population))
+
+
+def test_incremental_run_matches_full_run(make_ga):
+    incremental = make_ga(incremental=True)
+    incremental.run_genetic(generations=5)
+    full = make_ga()
+    full.run_genetic(generations=5)
+
+    assert np.allclose(incremental.fitness, full.fitness)
+
+
+@pytest.mark.parametrize("options", [{"n_workers": 2}, {"adaptive_batch": 5}])
+def test_incremental_rejects_other_evaluation_paths(evaluator, options):
+    with pytest.raises(ValueError):
+        ga_opt.Genetic_Algorithm(fitness_func=evaluator, incremental=True, **options)
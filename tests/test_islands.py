@@ -0,0 +1,27 @@
+import os
+import multiprocessing as mp
+import numpy as np
+import pytest
+import GA_core as ga_opt
+
+
+def test_islands_report_every_generation(make_ga, recorder):
+    ga = make_ga(cache_size=100)
+    ga.create_observer(recorder)
+    ga.run_genetic(generations=4, islands=2, migration_interval=2)
+
+    assert [record.generation for record in recorder.records] == [0, 1, 2, 3]
+    assert all(record.evaluations > 0 and record.cache_hits is not None for record in recorder.records)
+    # the sub-populations are gathered back, with their fitness
+    assert len(ga.population) == 30
+    assert np.isclose(np.min(ga.fitness), recorder.records[-1].best_score)
+
+
+def test_island_exiting_without_reporting_raises(make_ga, skus):
+    process = mp.Process(target=os._exit, args=(3,))
+    process.start()
+    process.join()
+
+    model = ga_opt.Island_Model(make_ga(), islands=1)
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        model._merge(mp.Queue(), [process], generations=1, skus=skus, poll_interval=0.1)
@@ -0,0 +1,39 @@
+import csv
+import json
+import dataclasses
+import pytest
+import GA_core as ga_opt
+
+
+def test_records_have_phase_times_and_counters(make_ga, recorder):
+    ga = make_ga(cache_size=100)
+    ga.create_observer(recorder)
+    ga.run_genetic(generations=3)
+
+    assert [record.generation for record in recorder.records] == [0, 1, 2]
+    for record in recorder.records:
+        assert record.total_time > 0
+        assert record.evaluation_time > 0
+        assert 0 < record.diversity <= 1
+        assert record.cache_hits is not None
+        assert record.replications_avoided is None and record.evaluations_saved is None
+    # each generation simulates the solutions missing from the cache
+    assert sum(record.evaluations for record in recorder.records) == ga.evaluations - len(ga.population)
+
+
+@pytest.mark.parametrize("extension", [".jsonl", ".csv"])
+def test_log_observer_writes_a_record_per_generation(make_ga, tmp_path, extension):
+    path = str(tmp_path / ("log" + extension))
+    ga = make_ga()
+    with ga_opt.LogObserver(path) as log:
+        ga.create_observer(log)
+        ga.run_genetic(generations=3)
+
+    with open(path, newline='') as file:
+        if extension == ".csv":
+            records = list(csv.DictReader(file))
+        else:
+            records = [json.loads(line) for line in file]
+
+    assert [int(record["generation"]) for record in records] == [0, 1, 2]
+    assert set(records[0]) == {field.name for field in dataclasses.fields(ga_opt.Generation_Stats)}
@@ -0,0 +1,26 @@
+import numpy as np
+import GA_core as ga_opt
+
+
+def test_parallel_fitness_equals_serial(make_ga, evaluator):
+    ga = make_ga()
+    codes, params = evaluator.encode(ga.population)
+
+    parallel = ga_opt.Parallel_Evaluator(evaluator, n_workers=2)
+    # a high cost per solution makes the evaluator split the population over the workers
+    parallel.cost_per_solution = 1.0
+    try:
+        assert parallel._nr_chunks(len(codes)) == 2
+        assert np.allclose(parallel.evaluate(codes, params), evaluator.evaluate(codes, params))
+    finally:
+        parallel.shutdown()
+
+
+def test_parallel_run_matches_serial_run(make_ga):
+    serial = make_ga()
+    serial.run_genetic(generations=3)
+    parallel = make_ga(n_workers=2)
+    parallel.evaluator.cost_per_solution = 1.0
+    parallel.run_genetic(generations=3)
+
+    assert np.allclose(serial.fitness, parallel.fitness)
@@ -0,0 +1,45 @@
+import pickle
+import numpy as np
+import pytest
+import supply_chain as sc
+from utilities import Scenario_Bank
+
+
+def test_bank_is_reproducible_from_its_seed(tmp_path):
+    bank = Scenario_Bank.create(str(tmp_path / "a.npy"), 50, 3, 20, mean=[5, 10, 20], seed=0, chunk_size=16)
+    again = Scenario_Bank.create(str(tmp_path / "b.npy"), 50, 3, 20, mean=[5, 10, 20], seed=0)
+
+    assert bank.demand.shape == (50, 3, 20)
+    assert np.array_equal(bank.demand, again.demand)
+    assert bank.scenario_id == again.scenario_id
+
+
+def test_unseeded_banks_differ_and_can_be_regenerated(tmp_path):
+    first = Scenario_Bank.create(str(tmp_path / "a.npy"), 10, 2, 20)
+    second = Scenario_Bank.create(str(tmp_path / "b.npy"), 10, 2, 20)
+    regenerated = Scenario_Bank.create(str(tmp_path / "c.npy"), 10, 2, 20, seed=first.metadata["seed"])
+
+    assert first.scenario_id != second.scenario_id
+    assert np.array_equal(first.demand, regenerated.demand)
+
+
+def test_scenarios_map_a_slice_of_the_bank(tmp_path):
+    bank = Scenario_Bank.create(str(tmp_path / "bank.npy"), 30, 2, 10, distribution="normal", mean=10, sd=3, seed=1)
+
+    assert np.array_equal(bank.scenarios(5, 12), bank.demand[5:12])
+    assert np.array_equal(bank.scenarios(25), bank.demand[25:])
+    assert np.array_equal(pickle.loads(pickle.dumps(bank)).demand, bank.demand)
+
+
+def test_invalid_distribution_raises(tmp_path):
+    with pytest.raises(ValueError):
+        Scenario_Bank.create(str(tmp_path / "bank.npy"), 10, 2, 10, distribution="uniform")
+
+
+def test_evaluator_on_a_bank_matches_in_memory_demand(tmp_path, skus):
+    bank = Scenario_Bank.create(str(tmp_path / "bank.npy"), 20, len(skus), 30, seed=2)
+    mapped = sc.Fitness_Evaluator(skus=skus, demand=bank.scenarios(), scenario_id=bank.scenario_id)
+    in_memory = sc.Fitness_Evaluator(skus=skus, demand=np.array(bank.demand))
+    population = [sc.Individual_Solution().solution_initialize(skus, np.random.default_rng(i)) for i in range(10)]
+
+    assert np.allclose(mapped.evaluate_population(population), in_memory.evaluate_population(population))
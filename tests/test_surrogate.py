@@ -0,0 +1,59 @@
+import numpy as np
+import GA_core as ga_opt
+import supply_chain as sc
+
+
+def test_surrogate_fits_a_separable_cost():
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, len(sc.Policy_Factory.options), size=(300, 4))
+    params = rng.integers(0, 100, size=(300, 4, 2))
+    fitness = ((params[..., 0] - 50.0) ** 2 + 10 * codes).sum(axis=1)
+
+    model = ga_opt.Surrogate_Model(alpha=1e-3)
+    model.add(codes[:200], params[:200], fitness[:200])
+
+    assert model.check(model.predict(codes[200:], params[200:]), fitness[200:]) > 0.95
+
+
+def test_surrogate_state_round_trip():
+    rng = np.random.default_rng(1)
+    codes = rng.integers(0, len(sc.Policy_Factory.options), size=(30, 3))
+    params = rng.integers(0, 100, size=(30, 3, 2))
+    model = ga_opt.Surrogate_Model()
+    model.add(codes, params, rng.random(30))
+
+    restored = ga_opt.Surrogate_Model()
+    restored.set_state(model.get_state())
+
+    assert np.allclose(restored.predict(codes, params), model.predict(codes, params))
+    assert restored.accuracy is None
+
+
+def test_surrogate_run_keeps_elitism_and_reports_savings(make_ga, recorder):
+    ga = make_ga(surrogate_fraction=0.5)
+    ga.create_observer(recorder)
+    ga.run_genetic(generations=10)
+
+    best = [record.best_score for record in recorder.records]
+    assert all(later <= earlier for earlier, later in zip(best, best[1:]))
+    assert recorder.records[-1].evaluations_saved == ga.evaluations_saved > 0
+    assert recorder.records[-1].surrogate_accuracy is not None
+    # the best solution's score is simulated, not predicted
+    best_solution = ga.population[int(np.argmin(ga.fitness))]
+    assert np.isclose(np.min(ga.fitness), ga.fitness_func.evaluate_population([best_solution])[0])
+
+
+def test_surrogate_simulates_a_holdout_of_the_discarded_solutions(make_ga):
+    ga = make_ga(surrogate_fraction=0.2)
+    ga.evaluate_population()
+    ga.step()
+    evaluations = ga.evaluations
+    saved = ga.evaluations_saved
+    ga.step()
+
+    simulated = ga.evaluations - evaluations
+    discarded = ga.evaluations_saved - saved
+    assert simulated + discarded <= len(ga.population)
+    # the solutions the model picks, plus at least one it discarded
+    new = simulated + discarded
+    assert simulated >= int(np.ceil(0.2 * new)) + 1